@@ -0,0 +1,340 @@
+"""Benchmarks of binheap against raw heapq.
+
+Every case is timed on a binheap heap and on the equivalent heapq code, and
+reported with the ratio of the two. Ratios are compared against a stored
+baseline rather than absolute times, so a baseline recorded on one machine
+stays meaningful on another.
+
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --sizes 10,1000,10000000 --kinds int
+    python benchmarks/bench.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench.py --compare benchmarks/baseline.json
+
+With --compare, the exit status is 1 if any ratio grew by more than
+--tolerance over its baseline.
+"""
+
+import argparse
+import gc
+import heapq
+import json
+import os
+import platform
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from binheap import MaxHeap, MinHeap, heapsort  # noqa: E402
+
+# Each measurement runs at least this many operations, small sizes are looped.
+MIN_OPS = 100_000
+
+
+class Heavy:
+    """Payload compared through a Python `__lt__`, like a dataclass."""
+
+    __slots__ = ('priority', 'payload')
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.payload = [priority] * 8
+
+    def __lt__(self, other):
+        return self.priority < other.priority
+
+
+def make_items(kind, size, rng):
+    priorities = [rng.randrange(size * 4) for _ in range(size)]
+    if kind == 'int':
+        return priorities
+    if kind == 'tuple':
+        return [(priority, str(priority)) for priority in priorities]
+    if kind == 'heavy':
+        return [Heavy(priority) for priority in priorities]
+    raise ValueError(f'unknown kind {kind!r}')
+
+
+# Every case returns a pair of functions taking the items and returning the
+# elapsed time of the binheap and heapq versions. Setup isn't timed.
+
+
+def case_push():
+    def with_binheap(items):
+        heap = MinHeap()
+        push = heap.push
+        start = perf_counter()
+        for item in items:
+            push(item)
+        return perf_counter() - start
+
+    def with_heapq(items):
+        heap, heappush = [], heapq.heappush
+        start = perf_counter()
+        for item in items:
+            heappush(heap, item)
+        return perf_counter() - start
+
+    return with_binheap, with_heapq
+
+
+def case_pop():
+    def with_binheap(items):
+        heap = MinHeap(items)
+        pop = heap.pop
+        start = perf_counter()
+        for _ in items:
+            pop()
+        return perf_counter() - start
+
+    def with_heapq(items):
+        heap, heappop = list(items), heapq.heappop
+        heapq.heapify(heap)
+        start = perf_counter()
+        for _ in items:
+            heappop(heap)
+        return perf_counter() - start
+
+    return with_binheap, with_heapq
+
+
+def case_push_pop():
+    def with_binheap(items):
+        heap = MinHeap(items)
+        push_pop = heap.push_pop
+        start = perf_counter()
+        for item in items:
+            push_pop(item)
+        return perf_counter() - start
+
+    def with_heapq(items):
+        heap, heappushpop = list(items), heapq.heappushpop
+        heapq.heapify(heap)
+        start = perf_counter()
+        for item in items:
+            heappushpop(heap, item)
+        return perf_counter() - start
+
+    return with_binheap, with_heapq
+
+
+def case_replace():
+    def with_binheap(items):
+        heap = MinHeap(items)
+        replace = heap.replace
+        start = perf_counter()
+        for item in items:
+            replace(item)
+        return perf_counter() - start
+
+    def with_heapq(items):
+        heap, heapreplace = list(items), heapq.heapreplace
+        heapq.heapify(heap)
+        start = perf_counter()
+        for item in items:
+            heapreplace(heap, item)
+        return perf_counter() - start
+
+    return with_binheap, with_heapq
+
+
+def case_build():
+    def with_binheap(items):
+        start = perf_counter()
+        MinHeap(items)
+        return perf_counter() - start
+
+    def with_heapq(items):
+        start = perf_counter()
+        heapq.heapify(list(items))
+        return perf_counter() - start
+
+    return with_binheap, with_heapq
+
+
+def case_heapsort():
+    def with_binheap(items):
+        start = perf_counter()
+        heapsort(items)
+        return perf_counter() - start
+
+    def with_heapq(items):
+        start = perf_counter()
+        heap = list(items)
+        heapq.heapify(heap)
+        heappop = heapq.heappop
+        [heappop(heap) for _ in range(len(heap))]
+        return perf_counter() - start
+
+    return with_binheap, with_heapq
+
+
+def case_max_push_pop():
+    # MaxHeap against the usual workaround of negating the values, which
+    # only works for numbers.
+    def with_binheap(items):
+        start = perf_counter()
+        heap = MaxHeap()
+        for item in items:
+            heap.push(item)
+        for _ in items:
+            heap.pop()
+        return perf_counter() - start
+
+    def with_heapq(items):
+        heappush, heappop = heapq.heappush, heapq.heappop
+        start = perf_counter()
+        heap = []
+        for item in items:
+            heappush(heap, -item)
+        for _ in items:
+            -heappop(heap)
+        return perf_counter() - start
+
+    return with_binheap, with_heapq
+
+
+CASES = {
+    'push': case_push,
+    'pop': case_pop,
+    'push_pop': case_push_pop,
+    'replace': case_replace,
+    'build': case_build,
+    'heapsort': case_heapsort,
+    'max_push_pop': case_max_push_pop,
+}
+
+# Cases that only make sense for some kinds of items. `push` takes tuples for
+# iterables of items.
+KINDS = {'push': ('int', 'heavy'), 'max_push_pop': ('int',)}
+
+
+def measure(runs, items, repeat):
+    """
+    Returns the best time per item of each function of `runs` over `repeat`
+    rounds, each looping over `items` until at least MIN_OPS items were
+    processed. The functions take turns, so that they all see the same load
+    of the machine.
+    """
+    loops = max(1, MIN_OPS // len(items))
+    best = [float('inf')] * len(runs)
+    gc_enabled = gc.isenabled()
+    gc.disable()  # like timeit, collections would add noise
+    try:
+        for _ in range(repeat):
+            for index, run in enumerate(runs):
+                elapsed = sum(run(items) for _ in range(loops))
+                best[index] = min(best[index], elapsed / (loops * len(items)))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def run_benchmarks(cases, kinds, sizes, repeat, seed):
+    results = []
+    for kind in kinds:
+        for size in sizes:
+            items = make_items(kind, size, random.Random(seed))
+            for name in cases:
+                if kind not in KINDS.get(name, (kind,)):
+                    continue
+                binheap_time, heapq_time = measure(CASES[name](), items, repeat)
+                result = {
+                    'case': name,
+                    'kind': kind,
+                    'size': size,
+                    'binheap': binheap_time,
+                    'heapq': heapq_time,
+                    'ratio': binheap_time / heapq_time,
+                }
+                results.append(result)
+                print(
+                    f'{name:>14} {kind:>6} {size:>10}  '
+                    f'binheap {binheap_time * 1e9:9.1f} ns  '
+                    f'heapq {heapq_time * 1e9:9.1f} ns  '
+                    f'ratio {result["ratio"]:5.2f}',
+                    file=sys.stderr,
+                )
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Returns a message for every result whose ratio is more than `tolerance`
+    above the ratio of the same case in `baseline`.
+    """
+    expected = {
+        (result['case'], result['kind'], result['size']): result['ratio']
+        for result in baseline['results']
+    }
+    regressions = []
+    for result in report['results']:
+        ratio = expected.get((result['case'], result['kind'], result['size']))
+        if ratio is not None and result['ratio'] > ratio * (1 + tolerance):
+            regressions.append(
+                f'{result["case"]} {result["kind"]} {result["size"]}: '
+                f'ratio {result["ratio"]:.2f}, baseline {ratio:.2f}'
+            )
+    return regressions
+
+
+def parse_list(value, convert=str):
+    return [convert(part) for part in value.split(',') if part]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', type=parse_list, default=list(CASES))
+    parser.add_argument('--kinds', type=parse_list, default=['int', 'tuple', 'heavy'])
+    parser.add_argument(
+        '--sizes',
+        type=lambda value: parse_list(value, int),
+        default=[10, 1000, 100_000],
+        help='comma separated, up to 10000000',
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--save-baseline', help='write the results as a baseline')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='allowed relative increase of a ratio, 0.25 by default',
+    )
+    args = parser.parse_args(argv)
+
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f'unknown cases: {", ".join(sorted(unknown))}')
+
+    report = run_benchmarks(args.cases, args.kinds, args.sizes, args.repeat, args.seed)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as file:
+                json.dump(report, file, indent=2)
+                file.write('\n')
+    if args.output is None and args.save_baseline is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        if regressions:
+            print('Regressions:', *regressions, sep='\n  ', file=sys.stderr)
+            return 1
+        print('No regressions.', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
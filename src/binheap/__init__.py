@@ -1,4 +1,26 @@
+from .concurrentheap import ConcurrentHeap
+from .daryheap import DaryHeap, DaryMaxHeap, DaryMinHeap
+from .fileheap import FileHeap, FileMaxHeap, FileMinHeap
 from .heap import Heap
+from .heapmap import HeapMap, MaxHeapMap, MinHeapMap
 from .heapsort import heapsort
+from .indexedheap import IndexedHeap, IndexedMaxHeap, IndexedMinHeap
 from .maxheap import MaxHeap
+from .merge import merge
 from .minheap import MinHeap
+from .minmaxheap import MinMaxHeap
+from .numericheap import NumericHeap, NumericMaxHeap, NumericMinHeap
+from .pairingheap import PairingHeap, PairingMaxHeap, PairingMinHeap, PairingNode
+from .running import RunningMedian, RunningQuantile
+from .sharedheap import SharedNumericHeap, SharedNumericMaxHeap, SharedNumericMinHeap
+from .timerheap import TimerHandle, TimerHeap
+
+
+def __getattr__(name):
+    # Importing asyncio takes longer than the rest of the package, the async
+    # heaps are only loaded once used.
+    if name in ('AsyncHeap', 'AsyncMaxHeap', 'AsyncMinHeap'):
+        from . import asyncheap
+
+        return getattr(asyncheap, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
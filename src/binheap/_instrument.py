@@ -0,0 +1,184 @@
+"""Instrumented subclasses of the heaps, see `Heap.instrument`.
+
+Instrumenting a heap swaps its class for a subclass wrapping the operations
+with timers, so heaps that are never instrumented don't pay anything for it.
+"""
+
+import sys
+from functools import wraps
+from inspect import getattr_static
+from time import perf_counter_ns
+
+from ._sift import heapify, heappop, heappush, heappushpop, heapreplace
+
+# Public operations timed by instrumented heaps, if their class has them.
+OPERATIONS = (
+    'clear',
+    'consume',
+    'discard',
+    'drain',
+    'heapify',
+    'meld',
+    'peek',
+    'pop',
+    'pop_many',
+    'push',
+    'push_many',
+    'push_pop',
+    'remove',
+    'replace',
+    'update',
+)
+
+# Instrumented subclass of every `(class, comparisons)` pair.
+_classes = {}
+
+
+class Stats:
+    """Statistics recorded by an instrumented heap."""
+
+    __slots__ = ('comparisons', 'operations', 'peak_size', '_depth')
+
+    def __init__(self, size):
+        self.comparisons = 0
+        # Name of every operation to `[count, total_ns, histogram]`, where the
+        # histogram maps `n` to the number of calls that took less than `n` ns
+        # but at least `n / 2`.
+        self.operations = {}
+        self.peak_size = size
+        self._depth = 0
+
+    def record(self, name, elapsed, size):
+        record = self.operations.get(name)
+        if record is None:
+            record = self.operations[name] = [0, 0, {}]
+        record[0] += 1
+        record[1] += elapsed
+        histogram, bucket = record[2], 1 << elapsed.bit_length()
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+        if size > self.peak_size:
+            self.peak_size = size
+
+
+def instrument(heap, comparisons):
+    cls = uninstrumented_class(type(heap))
+    heap.__class__ = _instrumented_class(cls, comparisons)
+    heap._stats = Stats(len(heap._heap))
+
+
+def uninstrument(heap):
+    if '_stats' in vars(heap):
+        heap.__class__ = uninstrumented_class(type(heap))
+        del heap._stats
+
+
+def uninstrumented_class(cls):
+    return cls.__dict__.get('_uninstrumented', cls)
+
+
+def footprint(heap):
+    """
+    Returns the approximate number of bytes used by `heap`: its attributes and
+    the stored entries, but not the items they refer to.
+    """
+    size = sys.getsizeof(heap) + sys.getsizeof(vars(heap))
+    for name, value in vars(heap).items():
+        if name != '_stats':
+            size += sys.getsizeof(value)
+    if isinstance(heap._heap, list):
+        size += sum(map(sys.getsizeof, heap._heap))
+    return size
+
+
+def _instrumented_class(cls, comparisons):
+    instrumented = _classes.get((cls, comparisons))
+    if instrumented is None:
+        namespace = {'__slots__': (), '_uninstrumented': cls}
+        for name in OPERATIONS:
+            method = getattr(cls, name, None)
+            if method is not None:
+                namespace[name] = _timed(name, method)
+        if comparisons:
+            namespace.update(_counting_engine(cls))
+        namespace['__reduce_ex__'] = _reduce_ex
+        namespace['stats'] = _stats
+        instrumented = type(cls.__name__, (cls,), namespace)
+        instrumented.__qualname__ = cls.__qualname__
+        instrumented.__module__ = cls.__module__
+        _classes[cls, comparisons] = instrumented
+    return instrumented
+
+
+def _timed(name, method):
+    @wraps(method)
+    def timed(self, *args, **kwargs):
+        stats = self._stats
+        if stats._depth:
+            # Called by another operation, which is the one being timed.
+            return method(self, *args, **kwargs)
+        stats._depth = 1
+        start = perf_counter_ns()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            stats._depth = 0
+            stats.record(name, elapsed, len(self._heap))
+
+    return timed
+
+
+def _counting_engine(cls):
+    """
+    Returns the methods counting the comparisons of the heaps of `cls`. The
+    heapq functions compare entries in C, heaps using them switch to the pure
+    Python engine, and large `pop_many` calls pop instead of sorting.
+    """
+    lt = cls._lt
+
+    def _lt(self, first, second):
+        self._stats.comparisons += 1
+        return lt(first, second)
+
+    # Sorting compares in C, bypassing `_lt`, so bulk operations sift instead.
+    namespace = {'_lt': _lt, '_can_sort': staticmethod(lambda heap: False)}
+    if isinstance(getattr_static(cls, '_heappush'), staticmethod):
+        namespace.update(
+            _heapify=lambda self, heap: heapify(heap, len(heap), self._lt),
+            _heappop=lambda self, heap: heappop(heap, self._lt),
+            _heappush=lambda self, heap, item: heappush(heap, item, self._lt),
+            _heappushpop=lambda self, heap, item: heappushpop(heap, item, self._lt),
+            _heapreplace=lambda self, heap, item: heapreplace(heap, item, self._lt),
+        )
+    return namespace
+
+
+def _reduce_ex(self, protocol):
+    # Instrumented heaps are pickled as an uninstrumented shallow copy.
+    cls = uninstrumented_class(type(self))
+    copy = cls.__new__(cls)
+    copy.__dict__.update(self.__dict__)
+    del copy._stats
+    return _unpickle, (copy,)
+
+
+def _unpickle(heap):
+    return heap
+
+
+def _stats(self):
+    stats = self._stats
+    return {
+        'operations': {
+            name: {
+                'count': count,
+                'total_seconds': total / 1e9,
+                'latency_ns': dict(sorted(histogram.items())),
+            }
+            for name, (count, total, histogram) in sorted(stats.operations.items())
+        },
+        'comparisons': stats.comparisons if '_lt' in type(self).__dict__ else None,
+        'size': len(self),
+        'peak_size': stats.peak_size,
+        'memory_bytes': footprint(self),
+    }
@@ -0,0 +1,113 @@
+"""Pure Python heap functions for any mutable sequence.
+
+They mirror the helpers of the heapq module but take the comparison function
+and the end of the heap as arguments, so they also work on typed arrays and
+on buffers that are larger than the heap they hold. `lt(a, b)` must return
+True if `a` belongs closer to the root than `b`.
+"""
+
+
+def siftdown(heap, startpos, pos, lt):
+    """Moves `heap[pos]` towards the root, stopping at `startpos`."""
+    newitem = heap[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = heap[parentpos]
+        if not lt(newitem, parent):
+            break
+        heap[pos] = parent
+        pos = parentpos
+    heap[pos] = newitem
+
+
+def siftup(heap, pos, endpos, lt):
+    """Moves `heap[pos]` towards the leaves of the heap `heap[:endpos]`.
+
+    Like heapq, the smaller child is moved up until a leaf is reached and the
+    item is then sifted back down, which saves comparisons on average.
+    """
+    startpos = pos
+    newitem = heap[pos]
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not lt(heap[childpos], heap[rightpos]):
+            childpos = rightpos
+        heap[pos] = heap[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    heap[pos] = newitem
+    siftdown(heap, startpos, pos, lt)
+
+
+def heapify(heap, endpos, lt):
+    for pos in reversed(range(endpos // 2)):
+        siftup(heap, pos, endpos, lt)
+
+
+# Counterparts of the heapq functions for sequences supporting `append` and
+# `pop`, such as typed arrays.
+
+
+def heappop(heap, lt):
+    last = heap.pop()  # index out of range error
+    if not heap:
+        return last
+    top, heap[0] = heap[0], last
+    siftup(heap, 0, len(heap), lt)
+    return top
+
+
+def heappush(heap, item, lt):
+    heap.append(item)
+    siftdown(heap, 0, len(heap) - 1, lt)
+
+
+def heappushpop(heap, item, lt):
+    if heap and lt(heap[0], item):
+        item, heap[0] = heap[0], item
+        siftup(heap, 0, len(heap), lt)
+    return item
+
+
+def heapreplace(heap, item, lt):
+    top, heap[0] = heap[0], item  # index out of range error
+    siftup(heap, 0, len(heap), lt)
+    return top
+
+
+# Counterparts of the functions above for heaps where each node has `d`
+# children instead of two.
+
+
+def siftdown_dary(heap, startpos, pos, lt, d):
+    newitem = heap[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) // d
+        parent = heap[parentpos]
+        if not lt(newitem, parent):
+            break
+        heap[pos] = parent
+        pos = parentpos
+    heap[pos] = newitem
+
+
+def siftup_dary(heap, pos, endpos, lt, d):
+    newitem = heap[pos]
+    childpos = d * pos + 1
+    while childpos < endpos:
+        bestpos = childpos
+        for otherpos in range(childpos + 1, min(childpos + d, endpos)):
+            if lt(heap[otherpos], heap[bestpos]):
+                bestpos = otherpos
+        if not lt(heap[bestpos], newitem):
+            break
+        heap[pos] = heap[bestpos]
+        pos = bestpos
+        childpos = d * pos + 1
+    heap[pos] = newitem
+
+
+def heapify_dary(heap, endpos, lt, d):
+    for pos in reversed(range((endpos + d - 2) // d)):
+        siftup_dary(heap, pos, endpos, lt, d)
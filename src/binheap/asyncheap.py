@@ -0,0 +1,91 @@
+import asyncio
+
+from .maxheap import MaxHeap
+from .minheap import MinHeap
+
+
+class AsyncHeap(asyncio.Queue):
+    """asyncio queue that hands out its items in heap order.
+
+    `await pop()` suspends until an item is available and, with a `maxsize`,
+    `await push()` suspends until there is room. It relies on asyncio.Queue
+    futures only, no thread locks are taken.
+    """
+
+    _heap_type = MinHeap
+
+    def __init__(self, maxsize=0, **kwargs):
+        """
+        :param maxsize: Max number of items, unbounded if <= 0
+        :param kwargs: Arguments of the underlying heap, e.g. `key`. Not
+        `capacity`: items it drops would still be counted by the queue, `maxsize`
+        bounds the heap instead.
+        """
+        if kwargs.get('capacity') is not None:
+            raise TypeError('capacity is not supported, use maxsize instead')
+        self._heap_kwargs = kwargs
+        super().__init__(maxsize)
+
+    async def pop(self):
+        """
+        Removes and returns the min/max element, waiting for one if the heap
+        is empty.
+        :return:
+        """
+        return await self.get()
+
+    async def pop_many(self, k):
+        """
+        Removes and returns up to k min/max elements in order. Waits until
+        the heap has at least one item.
+        :param k: Max number of elements to pop
+        :return:
+        """
+        if k <= 0:
+            return []
+        items = [await self.get()]
+        while len(items) < k and not self.empty():
+            items.append(self.get_nowait())
+        return items
+
+    def pop_nowait(self):
+        return self.get_nowait()
+
+    def peek(self):
+        """
+        Returns the min/max element without removing it. Raises IndexError if
+        the heap is empty.
+        :return:
+        """
+        return self._queue.peek()
+
+    async def push(self, item):
+        """
+        Pushes a single item, waiting for room if the heap is full.
+        :param item:
+        :return:
+        """
+        await self.put(item)
+
+    def push_nowait(self, item):
+        self.put_nowait(item)
+
+    # asyncio.Queue hooks
+
+    def _init(self, maxsize):
+        self._queue = self._heap_type(**self._heap_kwargs)
+
+    def _get(self):
+        return self._queue.pop()
+
+    def _put(self, item):
+        # Heap.push would push the elements of an iterable item one by one.
+        self._queue.push_many((item,))
+
+
+class AsyncMinHeap(AsyncHeap):
+    pass
+
+
+class AsyncMaxHeap(AsyncHeap):
+    _heap_type = MaxHeap
@@ -0,0 +1,208 @@
+import threading
+from itertools import count
+from time import monotonic
+
+from .minheap import MinHeap
+
+# Returned by the non-blocking helpers when there is nothing to pop.
+_EMPTY = object()
+
+
+class ConcurrentHeap:
+    """Thread-safe heap with blocking pops.
+
+    Items are kept in one or more shards, each a heap of `heap_type` with its
+    own lock. Pushes go to the shards in turn, so with several shards pushing
+    threads rarely contend. Pops take the best of the shard tops, which makes
+    them exactly ordered with a single shard and only approximately ordered
+    across shards while other threads are pushing.
+    """
+
+    def __init__(self, seq=(), heap_type=MinHeap, shards=1, **kwargs):
+        """
+        :param seq: Initial items of the heap
+        :param heap_type: Heap subclass of the shards, e.g. MinHeap or MaxHeap
+        :param shards: Number of shards
+        :param kwargs: Arguments of each shard, e.g. `key`
+        """
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+        seq = list(seq)
+        self._shards = [heap_type(seq[i::shards], **kwargs) for i in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._next_shard = count()
+        self._not_empty = threading.Condition(threading.Lock())
+        self._waiting = 0
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._shards})'
+
+    def clear(self):
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def peek(self):
+        """
+        Returns the min/max element without removing it. Raises IndexError if
+        the heap is empty.
+        :return:
+        """
+        for _ in range(len(self._shards) + 1):
+            index = self._best_shard()
+            if index is None:
+                break
+            with self._locks[index]:
+                if self._shards[index]:
+                    return self._shards[index].peek()
+        raise IndexError('peek from empty heap')
+
+    def pop(self, block=True, timeout=None):
+        """
+        Removes and returns the min/max element from the heap.
+        :param block: Wait for an item if the heap is empty
+        :param timeout: Max number of seconds to wait, forever if None
+        :return:
+        """
+        item = self._wait(self._try_pop, block, timeout)
+        if item is _EMPTY:
+            raise IndexError('pop from empty heap')
+        return item
+
+    def pop_many(self, k, block=True, timeout=None):
+        """
+        Removes and returns up to k min/max elements in order, locking each
+        shard once. Only waits until the heap has at least one item.
+        :param k: Max number of elements to pop
+        :param block: Wait for an item if the heap is empty
+        :param timeout: Max number of seconds to wait, forever if None
+        :return:
+        """
+        if k <= 0:
+            return []
+        items = self._wait(lambda: self._try_pop_many(k), block, timeout)
+        return [] if items is _EMPTY else items
+
+    def push(self, items, priority=None):
+        """Push items onto the heap.
+
+        - If `priority` is given then `items` is pushed as a single item, see
+        `Heap.push`.
+        - If `items` is an iterable then elements of the iterable are pushed
+        individually, see `push_many`.
+        - If `items` isn't an iterable then it is pushed as a single item.
+        :param items: Single item or an iterable
+        :param priority: Comparison key of the item
+        :return:
+        """
+        if priority is None:
+            try:
+                iter(items)
+            except TypeError:
+                pass
+            else:
+                self.push_many(items)
+                return
+        index = next(self._next_shard) % len(self._shards)
+        with self._locks[index]:
+            if priority is None:
+                self._shards[index].push(items)
+            else:
+                self._shards[index].push(items, priority)
+        self._notify(1)
+
+    def push_many(self, items):
+        """
+        Push elements of the iterable `items` onto a single shard, under a
+        single lock acquisition.
+        :param items: Iterable of items
+        :return:
+        """
+        items = list(items)
+        index = next(self._next_shard) % len(self._shards)
+        with self._locks[index]:
+            self._shards[index].push_many(items)
+        self._notify(len(items))
+
+    def _best_shard(self):
+        """
+        Returns the index of the shard with the best top, or None if all the
+        shards are empty. Shards are read without locking, the result must be
+        checked under the shard's lock.
+        """
+        best, best_top = None, None
+        for index, shard in enumerate(self._shards):
+            try:
+                top = shard._heap[0]
+            except IndexError:
+                continue
+            if best is None or shard._lt(top, best_top):
+                best, best_top = index, top
+        return best
+
+    def _notify(self, n):
+        # Pops register as waiting before checking the shards one last time,
+        # so a push can't be missed when no one is seen waiting here.
+        if self._waiting:
+            with self._not_empty:
+                self._not_empty.notify(n)
+
+    def _try_pop(self):
+        shards, locks = self._shards, self._locks
+        while True:
+            index = self._best_shard()
+            if index is None:
+                return _EMPTY
+            with locks[index]:
+                if shards[index]:
+                    return shards[index].pop()
+
+    def _try_pop_many(self, k):
+        shards, locks = self._shards, self._locks
+        if len(shards) == 1:
+            with locks[0]:
+                shard = shards[0]
+                items = shard.pop_many(k)
+            return items if items else _EMPTY
+        for lock in locks:
+            lock.acquire()
+        try:
+            items = []
+            while len(items) < k:
+                index = self._best_shard()
+                if index is None:
+                    break
+                items.append(shards[index].pop())
+        finally:
+            for lock in locks:
+                lock.release()
+        return items if items else _EMPTY
+
+    def _wait(self, try_pop, block, timeout):
+        """
+        Calls `try_pop` until it returns something else than _EMPTY, waiting
+        for pushes in between.
+        """
+        result = try_pop()
+        if result is not _EMPTY or not block:
+            return result
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._not_empty:
+            self._waiting += 1
+            try:
+                while True:
+                    result = try_pop()
+                    if result is not _EMPTY:
+                        return result
+                    if deadline is None:
+                        self._not_empty.wait()
+                    else:
+                        remaining = deadline - monotonic()
+                        if remaining <= 0:
+                            return _EMPTY
+                        self._not_empty.wait(remaining)
+            finally:
+                self._waiting -= 1
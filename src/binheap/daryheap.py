@@ -0,0 +1,72 @@
+from ._sift import heapify_dary, siftdown_dary, siftup_dary
+from .heap import Heap
+from .maxheap import MaxHeap
+from .minheap import MinHeap
+
+
+class DaryHeap(Heap):
+    """Heap where every node has `d` children instead of two.
+
+    The tree is log2(d) times shallower, so pushes move through fewer levels
+    and siblings compared by a pop are contiguous in memory. Pops compare up to
+    `d` children per level, which makes it a good fit for push-heavy loads.
+    """
+
+    def __init__(self, seq=(), key=None, capacity=None, stable=False, d=4):
+        """
+        :param seq: Initial items of the heap
+        :param key: See `Heap`
+        :param capacity: See `Heap`
+        :param stable: See `Heap`
+        :param d: Number of children of each node. It comes last so that the
+        positional arguments are the same as for MinHeap and MaxHeap.
+        """
+        if d < 2:
+            raise ValueError('d must be at least 2')
+        self._d = d
+        super().__init__(seq, key, capacity, stable)
+
+    @property
+    def d(self):
+        return self._d
+
+    def _can_meld(self, other):
+        return super()._can_meld(other) and other._d == self._d
+
+    def _children(self, pos, size):
+        first = self._d * pos + 1
+        return range(first, min(first + self._d, size))
+
+    def _heapify(self, heap):
+        heapify_dary(heap, len(heap), self._lt, self._d)
+
+    def _heappop(self, heap):
+        last = heap.pop()  # index out of range error
+        if not heap:
+            return last
+        top, heap[0] = heap[0], last
+        siftup_dary(heap, 0, len(heap), self._lt, self._d)
+        return top
+
+    def _heappush(self, heap, item):
+        heap.append(item)
+        siftdown_dary(heap, 0, len(heap) - 1, self._lt, self._d)
+
+    def _heappushpop(self, heap, item):
+        if heap and self._lt(heap[0], item):
+            item, heap[0] = heap[0], item
+            siftup_dary(heap, 0, len(heap), self._lt, self._d)
+        return item
+
+    def _heapreplace(self, heap, item):
+        top, heap[0] = heap[0], item  # index out of range error
+        siftup_dary(heap, 0, len(heap), self._lt, self._d)
+        return top
+
+
+class DaryMinHeap(DaryHeap, MinHeap):
+    pass
+
+
+class DaryMaxHeap(DaryHeap, MaxHeap):
+    pass
@@ -0,0 +1,264 @@
+import mmap
+import operator
+import os
+import struct
+
+from ._sift import heapify, heappop, heappush, heappushpop, heapreplace
+from .heap import Heap
+
+# Magic, order, size and record format of the heap, followed by the records
+# starting at `_DATA_OFFSET`. Formats take up to `_MAX_FORMAT` bytes.
+_MAX_FORMAT = 32
+_HEADER = struct.Struct(f'8sc7xq{_MAX_FORMAT}s')
+_SIZE = struct.Struct('q')
+_SIZE_OFFSET = 16
+_DATA_OFFSET = 64
+_MAGIC = b'BINHEAP1'
+
+# Number of records a new file has room for.
+_INITIAL_CAPACITY = 1024
+
+# `struct` prefixes setting the byte order, size and alignment of the fields.
+_BYTE_ORDERS = '@=<>!'
+
+
+def _portable(fmt):
+    """
+    Returns `fmt` with a little-endian prefix if it has none, so that files
+    don't depend on the byte order and alignment of the machine. Raises
+    ValueError if it doesn't fit in the header.
+    """
+    if not fmt.startswith(tuple(_BYTE_ORDERS)):
+        fmt = '<' + fmt
+    if len(fmt.encode()) > _MAX_FORMAT:
+        raise ValueError(f'record format {fmt!r} is longer than {_MAX_FORMAT} bytes')
+    return fmt
+
+
+class _Records:
+    """List-like view of the fixed-width records of a heap file.
+
+    Records are packed with a `struct` format and unpacked to tuples, or to
+    plain values for single-field formats. The file grows by doubling.
+    """
+
+    def __init__(self, path, fmt, order):
+        self.path = path
+        if fmt is not None:
+            fmt = _portable(fmt)
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        try:
+            if exists:
+                header = self._file.read(_HEADER.size)
+                magic, file_order, self._size, file_fmt = _HEADER.unpack(header)
+                file_fmt = file_fmt.rstrip(b'\0').decode()
+                if magic != _MAGIC or file_order != order:
+                    raise ValueError(f'{path} is not a heap file of this order')
+                if fmt is not None and fmt != file_fmt:
+                    raise ValueError(f'{path} stores {file_fmt!r} records')
+                fmt = file_fmt
+            else:
+                fmt = '<d' if fmt is None else fmt
+                self._size = 0
+                self._file.write(_HEADER.pack(_MAGIC, order, 0, fmt.encode()))
+                self._file.truncate(
+                    _DATA_OFFSET + _INITIAL_CAPACITY * struct.calcsize(fmt)
+                )
+            self._record = struct.Struct(fmt)
+            self.scalar = len(self._record.unpack(bytes(self._record.size))) == 1
+            self._map()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __delitem__(self, index):
+        index = self._index(index)
+        size, start = self._record.size, self._offset(index)
+        self._mmap.move(start, start + size, (self._size - index - 1) * size)
+        self._set_size(self._size - 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        offset = self._offset(self._index(index))
+        record = self._record.unpack_from(self._mmap, offset)
+        return record[0] if self.scalar else record
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    def __len__(self):
+        return self._size
+
+    def __setitem__(self, index, record):
+        self._pack(self._index(index), record)
+
+    @property
+    def format(self):
+        return self._record.format
+
+    def append(self, record):
+        # The record is written before the size, a crash in between must not
+        # leave garbage in the heap.
+        if self._offset(self._size + 1) > len(self._mmap):
+            self._grow(self._size + 1)
+        self._pack(self._size, record)
+        self._set_size(self._size + 1)
+
+    def clear(self):
+        self._set_size(0)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def extend(self, records):
+        records = list(records)
+        if self._offset(self._size + len(records)) > len(self._mmap):
+            self._grow(self._size + len(records))
+        start = self._size
+        for index, record in enumerate(records, start):
+            self._pack(index, record)
+        self._set_size(start + len(records))
+
+    def flush(self):
+        self._mmap.flush()
+
+    def pop(self):
+        if not self._size:
+            raise IndexError('pop from empty heap')
+        record = self[self._size - 1]
+        self._set_size(self._size - 1)
+        return record
+
+    def _grow(self, min_records):
+        capacity = (len(self._mmap) - _DATA_OFFSET) // self._record.size
+        while capacity < min_records:
+            capacity *= 2
+        self._mmap.close()
+        self._file.truncate(self._offset(capacity))
+        self._map()
+
+    def _index(self, index):
+        return range(self._size)[index]  # index out of range error
+
+    def _map(self):
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+
+    def _offset(self, index):
+        return _DATA_OFFSET + index * self._record.size
+
+    def _pack(self, index, record):
+        offset = self._offset(index)
+        if self.scalar:
+            self._record.pack_into(self._mmap, offset, record)
+        else:
+            self._record.pack_into(self._mmap, offset, *record)
+
+    def _set_size(self, size):
+        self._size = size
+        _SIZE.pack_into(self._mmap, _SIZE_OFFSET, size)
+
+
+class FileHeap(Heap):
+    """Heap of fixed-width records stored in a memory-mapped file.
+
+    The heap is persistent: opening an existing file takes O(1) and doesn't
+    re-heapify. Only the pages being sifted through need to be in memory, so
+    heaps can be larger than RAM. Records are described by a `struct` format,
+    e.g. 'dQ' for a float priority and an integer id, and compared as tuples.
+    """
+
+    _order = b'<'
+
+    def __init__(self, path, fmt=None):
+        """
+        :param path: Path of the heap file, created if it doesn't exist
+        :param fmt: `struct` format of the records, 'd' for a new file if None.
+        Fields are little-endian and unaligned unless the format starts with
+        another byte order, so files can be moved between machines.
+        """
+        super().__init__()
+        self._heap = _Records(path, fmt, self._order)
+
+    def __reduce__(self):
+        # A copy would be a second handle on the same file, each with its own
+        # size, and writes through one would overwrite records of the other.
+        raise TypeError(
+            f'cannot pickle {self.__class__.__name__}, re-open it from its path'
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def format(self):
+        return self._heap.format
+
+    @property
+    def path(self):
+        return self._heap.path
+
+    def close(self):
+        if self._n_removed:
+            self._compact()
+        self._heap.close()
+
+    def push(self, items):
+        """
+        Same as `Heap.push`, except that a tuple is pushed as a single record
+        if the records have several fields.
+        :param items: Single record or an iterable
+        :return:
+        """
+        if isinstance(items, tuple) and not self._heap.scalar:
+            items = [items]
+        super().push(items)
+
+    def flush(self):
+        """
+        Writes the changes to disk, dropping the discarded records first.
+        :return:
+        """
+        if self._n_removed:
+            self._compact()
+        self._heap.flush()
+
+    def _can_meld(self, other):
+        # Moving the records of a file into another is never free.
+        return False
+
+    @staticmethod
+    def _can_sort(heap):
+        # Sorting would rewrite the whole file, popping only touches the pages
+        # sifted through.
+        return False
+
+    def _heapify(self, heap):
+        heapify(heap, len(heap), self._lt)
+
+    def _heappop(self, heap):
+        return heappop(heap, self._lt)
+
+    def _heappush(self, heap, item):
+        heappush(heap, item, self._lt)
+
+    def _heappushpop(self, heap, item):
+        return heappushpop(heap, item, self._lt)
+
+    def _heapreplace(self, heap, item):
+        return heapreplace(heap, item, self._lt)
+
+
+class FileMinHeap(FileHeap):
+    pass
+
+
+class FileMaxHeap(FileHeap):
+    _lt = staticmethod(operator.gt)
+    _order = b'>'
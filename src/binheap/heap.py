@@ -1,16 +1,106 @@
 import heapq
+import operator
+from collections import Counter
+from itertools import count, islice
+from operator import itemgetter
 from typing import List
 
+from . import _instrument
+
+# Returns the item of a `(key, tiebreak, item)` entry.
+_get_item = itemgetter(2)
+
+
+def _identity(item):
+    # Key of stable heaps created without a key function.
+    return item
+
+
+def _advance_counter(cls, tiebreaks):
+    """
+    Moves the insertion counter of `cls`, see `Heap._counter`, past the
+    `tiebreaks` of restored entries. Counters start over in every process,
+    new entries must not tie with the ones of a heap pickled by another one.
+    """
+    owner = next(base for base in cls.__mro__ if '_counter' in vars(base))
+    counter = owner._counter
+    start = next(counter)
+    step = next(counter) - start
+    last = max(tiebreaks, key=lambda tiebreak: tiebreak * step, default=start)
+    start = max(start + 2 * step, last + step, key=lambda value: value * step)
+    owner._counter = count(start, step)
+
+
+# `pop_many(k)` sorts the whole heap instead of popping k times once k is at
+# least this fraction of the heap.
+_SORT_FRACTION = 1 / 4
+
 
 class Heap:
-    def __init__(self, seq=()):
-        self._heap: List = list(seq)
-        heapq.heapify(self._heap)
+    # Functions maintaining the heap invariant over `_heap`. Subclasses
+    # ordering their elements differently replace them.
+    _heapify = staticmethod(heapq.heapify)
+    _heappop = staticmethod(heapq.heappop)
+    _heappush = staticmethod(heapq.heappush)
+    _heappushpop = staticmethod(heapq.heappushpop)
+    _heapreplace = staticmethod(heapq.heapreplace)
+
+    # Returns True if the first element must be closer to the root than the
+    # second one. The heapq functions don't need it, it is used by the pure
+    # Python engines of subclasses and to compare the tops of different heaps.
+    _lt = staticmethod(operator.lt)
+
+    # True if the elements are popped in descending order. Sorting `_heap` in
+    # that order leaves a valid heap.
+    _reverse = False
+
+    # Insertion counter stored in keyed entries. Equal keys are ordered by the
+    # counter so that items never get compared with each other. It is shared
+    # by all the heaps of a class, entries of melded heaps never tie.
+    _counter = count()
+
+    # Items passed to `discard` that are still stored in `_heap`, and their
+    # number. The stored items are counted once `discard` is first called,
+    # until then `_removed` is None and none of this costs anything.
+    _removed = None
+    _n_removed = 0
+
+    def __init__(self, seq=(), key=None, capacity=None, stable=False):
+        """
+        :param seq: Initial items of the heap
+        :param key: Function of one argument used to extract the comparison
+        key of each item. It is called exactly once per item, on insertion.
+        :param capacity: Max number of items. Once full, a pushed item
+        replaces the root if it belongs after it and is dropped otherwise, so
+        a MinHeap keeps the `capacity` largest items and a MaxHeap the
+        `capacity` smallest ones.
+        :param stable: Order items with equal keys by insertion, without ever
+        comparing the items, even if there is no key function. Always the case
+        with a key function. Stable heaps accept a `priority` in `push`.
+        """
+        if capacity is not None and capacity < 0:
+            raise ValueError('capacity must be non-negative')
+        if key is None and stable:
+            key = _identity
+        self._key = key
+        self._capacity = capacity
+        self._heap: List = self._entries(seq)
+        self._heapify(self._heap)
+        if capacity is not None:
+            while len(self._heap) > capacity:
+                self._heappop(self._heap)
 
     def __contains__(self, item):
-        return item in self._heap
+        if self._removed is not None:
+            return self._counts[item] > self._removed[item]
+        if self._key is None:
+            return item in self._heap
+        return item in map(_get_item, self._heap)
 
     def __delitem__(self, key):
+        if self._removed is not None:
+            self._compact()
+            self._reset_removed()
         del self._heap[key]
         self.heapify()
 
@@ -18,25 +108,193 @@ class Heap:
         return self.__class__ == other.__class__ and self.to_list() == other.to_list()
 
     def __getitem__(self, item):
-        return self._heap[item]
+        if self._n_removed:
+            self._compact()
+        if self._key is None:
+            return self._heap[item]
+        if isinstance(item, slice):
+            return [entry[2] for entry in self._heap[item]]
+        return self._heap[item][2]
 
     def __iter__(self):
-        return iter(self._heap)
+        if self._n_removed:
+            self._compact()
+        if self._key is None:
+            return iter(self._heap)
+        return map(_get_item, self._heap)
 
     def __len__(self):
-        return len(self._heap)
+        return len(self._heap) - self._n_removed
+
+    def __setstate__(self, state):
+        # Heaps pickled before keys and capacities were supported lack them.
+        state.setdefault('_key', None)
+        state.setdefault('_capacity', None)
+        self.__dict__.update(state)
+        if self._key is not None:
+            _advance_counter(type(self), [entry[1] for entry in self._heap])
 
     def __str__(self):
-        return str(self._heap)
+        return str(self.to_list())
 
     def __repr__(self):
-        return f'{self.__class__.__name__}({self._heap if self._heap else ""})'
+        items = self.to_list()
+        return f'{self.__class__.__name__}({items if items else ""})'
+
+    @property
+    def capacity(self):
+        return self._capacity
 
     def clear(self):
+        self._reset_removed()
         self._heap.clear()
 
+    def consume(self, items):
+        """Push elements of the iterable `items` in a single tight loop.
+
+        On a heap with a capacity, once it is full every item costs one
+        comparison against the root unless it is kept.
+        :param items: Iterable of items
+        :return:
+        """
+        heap, capacity = self._heap, self._capacity
+        if capacity is None:
+            self.push_many(items)
+            return
+        if self._removed is not None:
+            for entry in self._entries(items):
+                self._push_entry(entry)
+            return
+        items = iter(items)
+        if len(heap) < capacity:
+            entries = self._entries(islice(items, capacity - len(heap)))
+            heap.extend(entries)
+            self._heapify(heap)
+        heappushpop = self._heappushpop
+        if self._key is None:
+            for item in items:
+                heappushpop(heap, item)
+        else:
+            key, counter = self._key, self._counter
+            for item in items:
+                heappushpop(heap, (key(item), next(counter), item))
+
+    def discard(self, item):
+        """Remove one occurrence of `item` from the heap if it is present.
+
+        The item is only marked as removed, it is dropped once it reaches the
+        root or when more than half of the stored items are removed ones, so
+        this is O(1) amortized. The first call counts the items of the heap in
+        O(n), from then on pushes and pops keep the counts up to date and
+        `in` is O(1). Items must be hashable.
+        :param item: Item to remove
+        :return: True if the item was in the heap
+        """
+        if self._removed is None:
+            self._counts = Counter(self)
+            self._removed = Counter()
+            self._n_removed = 0
+        if self._counts[item] <= self._removed[item]:
+            return False
+        self._removed[item] += 1
+        self._n_removed += 1
+        if self._n_removed > len(self._heap) // 2:
+            self._compact()
+        else:
+            self._skip_removed()
+        return True
+
+    def drain(self):
+        """
+        Removes and returns all the elements in order, leaving the heap empty.
+        See `pop_many`.
+        :return:
+        """
+        return self.pop_many(len(self))
+
     def heapify(self):
-        return heapq.heapify(self._heap)
+        if self._n_removed:
+            self._compact()
+        else:
+            self._heapify(self._heap)
+
+    def instrument(self, comparisons=False):
+        """Start recording statistics about this heap, see `stats`.
+
+        The class of the heap is swapped for a subclass timing its operations,
+        so heaps that are never instrumented don't pay anything for it.
+        Calling it again resets the statistics.
+        :param comparisons: Also count comparisons. Heaps using the heapq
+        functions switch to the slower pure Python engine for that.
+        :return:
+        """
+        _instrument.instrument(self, comparisons)
+
+    def iter_sorted(self):
+        """Yields the items from the min/max one on, without modifying the heap.
+
+        The tree is walked with a frontier heap of the children of the items
+        yielded so far, so the first k items cost O(k log k) whatever the size
+        of the heap. The heap mustn't be modified during the iteration.
+        :return:
+        """
+        heap, children = self._heap, self._children
+        if not heap:
+            return
+        removed = self._removed.copy() if self._n_removed else None
+        heappop, heappush = self._heappop, self._heappush
+        frontier = [(heap[0], 0)]
+        while frontier:
+            entry, pos = heappop(frontier)
+            for child in children(pos, len(heap)):
+                heappush(frontier, (heap[child], child))
+            item = self._item(entry)
+            if removed and removed[item]:
+                removed[item] -= 1
+                continue
+            yield item
+
+    def meld(self, other):
+        """Move all the items of `other` into this heap, leaving it empty.
+
+        If both heaps have the same type and key function, the stored entries
+        are moved as they are: the smaller heap is pushed into the larger one,
+        or both are concatenated and re-heapified if their sizes are close
+        (see `push_many`).
+        :param other: Heap to meld into this one
+        :return:
+        """
+        if other is self:
+            return
+        if self._capacity is None and self._can_meld(other):
+            if len(other._heap) > len(self._heap):
+                self._heap, other._heap = other._heap, self._heap
+            self._push_entries(other._heap)
+        else:
+            self.consume(other)
+        other.clear()
+
+    @classmethod
+    def merge(cls, *heaps, **kwargs):
+        """Returns a new heap holding the items of all `heaps`.
+
+        The heaps are left untouched. Entries of heaps with the same type and
+        key function as the new heap are copied without re-computing keys and
+        the largest of them is copied without being re-heapified.
+        :param heaps: Heaps to merge
+        :param kwargs: Arguments of the new heap
+        :return:
+        """
+        merged = cls(**kwargs)
+        for heap in sorted(heaps, key=len, reverse=True):
+            if merged._capacity is None and merged._can_meld(heap):
+                if merged._heap:
+                    merged._push_entries(heap._heap)
+                else:
+                    merged._heap.extend(heap._heap)
+            else:
+                merged.consume(heap)
+        return merged
 
     def peek(self):
         """
@@ -44,39 +302,297 @@ class Heap:
         removing it from the heap. Equivalent to heap[0].
         :return:
         """
-        return self._heap[0]  # index out of range error
+        if self._key is None:
+            return self._heap[0]  # index out of range error
+        return self._heap[0][2]
+
+    def peek_many(self, k):
+        """
+        Returns the k min/max elements in order, without removing them. This
+        costs O(k log k), see `iter_sorted`.
+        :param k: Number of elements. All of them if k >= len(heap).
+        :return:
+        """
+        return list(islice(self.iter_sorted(), max(k, 0)))
 
     def pop(self):
         """
         Removes and returns the min/max element from the heap.
         :return:
         """
-        return heapq.heappop(self._heap)
+        if self._key is None and self._removed is None:
+            return self._heappop(self._heap)
+        item = self._item(self._heappop(self._heap))
+        if self._removed is not None:
+            self._uncount(self._counts, item)
+            self._skip_removed()
+        return item
+
+    def pop_many(self, k):
+        """Removes and returns the k min/max elements in order.
+
+        Once k is at least a quarter of the heap, the stored elements are
+        sorted in place and the first k sliced off instead of being popped one
+        by one, a sorted list being a valid heap.
+        :param k: Number of elements to pop. All of them if k >= len(heap).
+        :return:
+        """
+        if self._n_removed:
+            self._compact()
+        heap = self._heap
+        k = min(max(k, 0), len(heap))
+        if self._can_sort(heap) and k >= len(heap) * _SORT_FRACTION:
+            self._sort(heap)
+            entries = heap[:k]
+            del heap[:k]
+        else:
+            heappop = self._heappop
+            entries = [heappop(heap) for _ in range(k)]
+        items = entries if self._key is None else list(map(_get_item, entries))
+        if self._removed is not None:
+            self._counts -= Counter(items)
+        return items
 
-    def push(self, items):
+    def push(self, items, priority=None):
         """Push items onto the heap.
 
+        - If `priority` is given then `items` is pushed as a single item,
+        ordered by `priority` instead of its key. Items with equal priorities
+        are popped in insertion order and never compared. Requires a key
+        function or `stable=True`.
         - If `items` is an iterable then elements of the iterable are pushed
-        individually.
+        individually, see `push_many`.
         - If `items` isn't an iterable then it is pushed as a single item.
         :param items: Single item or an iterable
+        :param priority: Comparison key of the item
         :return:
         """
-        try:
-            for item in items:
-                heapq.heappush(self._heap, item)
-        except TypeError:
-            heapq.heappush(self._heap, items)
+        if priority is None:
+            try:
+                iter(items)
+            except TypeError:
+                if self._key is None and self._removed is None:
+                    heap, capacity = self._heap, self._capacity
+                    if capacity is None or len(heap) < capacity:
+                        self._heappush(heap, items)
+                    else:
+                        self._heappushpop(heap, items)
+                    return
+                entry = self._entry(items)
+            else:
+                self.push_many(items)
+                return
+        elif self._key is None:
+            raise TypeError('priority requires a key function or stable=True')
+        else:
+            entry = priority, next(self._counter), items
+        heap, capacity = self._heap, self._capacity
+        if self._removed is not None:
+            self._push_entry(entry)
+        elif capacity is not None and len(heap) >= capacity:
+            self._heappushpop(heap, entry)
+        else:
+            self._heappush(heap, entry)
+
+    def push_many(self, items):
+        """Push elements of the iterable `items` onto the heap.
+
+        Pushing k elements one by one costs O(k log(n + k)) in the worst case
+        while appending them all and re-heapifying costs O(n + k). The latter
+        is used once the batch is at least as large as the heap. On a heap
+        with a capacity, this is the same as `consume`.
+        :param items: Iterable of items
+        :return:
+        """
+        if self._capacity is not None:
+            self.consume(items)
+            return
+        entries = self._entries(items)
+        self._push_entries(entries)
+        if self._removed is not None:
+            self._counts.update(map(self._item, entries))
+            self._skip_removed()
 
     def push_pop(self, item):
-        return heapq.heappushpop(self._heap, item)
+        if self._key is None and self._removed is None:
+            return self._heappushpop(self._heap, item)
+        popped = self._item(self._heappushpop(self._heap, self._entry(item)))
+        if self._removed is not None:
+            self._counts[item] += 1
+            self._uncount(self._counts, popped)
+            self._skip_removed()
+        return popped
 
     def replace(self, item):
-        return heapq.heapreplace(self._heap, item)
+        if self._key is None and self._removed is None:
+            return self._heapreplace(self._heap, item)
+        popped = self._item(self._heapreplace(self._heap, self._entry(item)))
+        if self._removed is not None:
+            self._counts[item] += 1
+            self._uncount(self._counts, popped)
+            self._skip_removed()
+        return popped
+
+    def stats(self):
+        """Returns the statistics recorded since `instrument` was called.
+
+        A dict with:
+        - operations: count, total time and latency histogram of every
+        operation called, the histogram maps `n` to the number of calls that
+        took less than `n` nanoseconds but at least `n / 2`.
+        - comparisons: number of comparisons, None if they aren't counted.
+        - size and peak_size: current and max number of stored elements.
+        - memory_bytes: approximate size of the heap, excluding its items.
+        :return:
+        """
+        raise RuntimeError('heap is not instrumented, call instrument() first')
 
     def to_list(self):
         """
         Returns heap elements as a new list.
         :return:
         """
-        return list(self._heap)
+        return list(self)
+
+    def uninstrument(self):
+        """
+        Stops recording statistics about this heap.
+        :return:
+        """
+        _instrument.uninstrument(self)
+
+    def _can_meld(self, other):
+        """
+        Returns True if the entries stored by `other` can be moved into this
+        heap as they are.
+        """
+        return (
+            type(other) is type(self)
+            and other._key is self._key
+            and self._removed is None
+            and other._removed is None
+        )
+
+    @staticmethod
+    def _can_sort(heap):
+        """
+        Returns True if `heap` can be sorted by `_sort`.
+        """
+        return True
+
+    @staticmethod
+    def _children(pos, size):
+        """
+        Returns the positions of the children of `pos` in a heap of `size`
+        elements.
+        """
+        return range(2 * pos + 1, min(2 * pos + 3, size))
+
+    def _compact(self):
+        """
+        Drops the removed items from `_heap` and re-heapifies it, in O(n).
+        """
+        heap, removed, item_of = self._heap, self._removed, self._item
+        self._counts -= removed
+        size = 0
+        for entry in heap:
+            item = item_of(entry)
+            if removed[item]:
+                removed[item] -= 1
+            else:
+                heap[size] = entry
+                size += 1
+        for _ in range(len(heap) - size):
+            heap.pop()
+        removed.clear()
+        self._n_removed = 0
+        self._heapify(heap)
+
+    def _entry(self, item):
+        """
+        Returns the element stored in `_heap` for `item`: the item itself, or
+        a `(key, tiebreak, item)` tuple if the heap has a key function.
+        """
+        if self._key is None:
+            return item
+        return self._key(item), next(self._counter), item
+
+    def _entries(self, items):
+        """
+        Returns a new list of the elements stored in `_heap` for `items`.
+        """
+        if self._key is None:
+            return list(items)
+        items = list(items)
+        return list(zip(map(self._key, items), self._counter, items))
+
+    def _item(self, entry):
+        """
+        Reverse of `_entry`.
+        """
+        return entry if self._key is None else entry[2]
+
+    def _push_entry(self, entry):
+        """
+        Pushes a single stored element, or push-pops it if the heap is full.
+        """
+        heap, capacity = self._heap, self._capacity
+        if capacity is not None and len(self) >= capacity:
+            popped = self._heappushpop(heap, entry)
+            if self._removed is not None:
+                self._counts[self._item(entry)] += 1
+                self._uncount(self._counts, self._item(popped))
+        else:
+            self._heappush(heap, entry)
+            if self._removed is not None:
+                self._counts[self._item(entry)] += 1
+        if self._removed is not None:
+            self._skip_removed()
+
+    def _push_entries(self, entries):
+        """
+        Pushes the stored elements `entries`, see `push_many`.
+        """
+        heap = self._heap
+        if len(entries) >= len(heap):
+            heap.extend(entries)
+            self._heapify(heap)
+        else:
+            heappush = self._heappush
+            for entry in entries:
+                heappush(heap, entry)
+
+    def _reset_removed(self):
+        """
+        Stops counting the stored items, which must not include removed ones
+        unless `_heap` is about to be cleared.
+        """
+        if self._removed is not None:
+            del self._counts, self._removed, self._n_removed
+
+    def _sort(self, heap):
+        heap.sort(reverse=self._reverse)
+
+    def _skip_removed(self):
+        """
+        Pops the removed items found at the root, so that it is never one.
+        """
+        heap, removed = self._heap, self._removed
+        while self._n_removed:
+            item = self._item(heap[0])
+            if not removed[item]:
+                break
+            self._heappop(heap)
+            self._uncount(self._counts, item)
+            self._uncount(removed, item)
+            self._n_removed -= 1
+
+    @staticmethod
+    def _uncount(counts, item):
+        """
+        Decrements the count of `item` without leaving zero counts behind.
+        """
+        if counts[item] == 1:
+            del counts[item]
+        else:
+            counts[item] -= 1
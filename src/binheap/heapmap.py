@@ -0,0 +1,190 @@
+import heapq
+from itertools import count
+
+from .maxheap import heapify_max, heappop_max, heappush_max
+
+# The index of the tops is rebuilt once it holds this many stale entries more
+# than there are heaps.
+_MIN_STALE_ENTRIES = 64
+
+
+class HeapMap:
+    """Collection of many small heaps, one per hashable key.
+
+    Each heap is a bare list, so a key costs a dict slot and a list instead of
+    a whole Heap instance. The tops of all the heaps are indexed by another
+    heap of `(top, tiebreak, key)` entries to find the best item across keys.
+    Entries aren't removed when a top changes, they are recognized as stale
+    when they reach the root of the index and dropped. The index is only built
+    by the first `peek_best` or `pop_best`, maps that are never asked for the
+    best item don't pay for it.
+    """
+
+    __slots__ = ('_heaps', '_index', '_size')
+
+    # Functions maintaining the heap invariant of the lists, see `Heap`.
+    _heapify = staticmethod(heapq.heapify)
+    _heappop = staticmethod(heapq.heappop)
+    _heappush = staticmethod(heapq.heappush)
+
+    # Tiebreak of the index entries, so that keys never get compared.
+    _counter = count()
+
+    def __init__(self, seq=()):
+        """
+        :param seq: Mapping of key to items or an iterable of
+        `(key, items)` pairs
+        """
+        self._heaps = {}
+        self._index = None
+        self._size = 0
+        for key, items in dict(seq).items():
+            self.push_many(key, items)
+
+    def __contains__(self, key):
+        return key in self._heaps
+
+    def __delitem__(self, key):
+        self._size -= len(self._heaps.pop(key))
+
+    def __iter__(self):
+        """
+        Yields the keys having items.
+        """
+        return iter(self._heaps)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._heaps if self._heaps else ""})'
+
+    def clear(self):
+        self._heaps.clear()
+        self._index = None
+        self._size = 0
+
+    def peek(self, key):
+        """
+        Returns the min/max item of `key` without removing it. Raises KeyError
+        if `key` has no items.
+        :param key:
+        :return:
+        """
+        return self._heaps[key][0]
+
+    def peek_best(self):
+        """
+        Returns the `(key, item)` pair with the min/max item across all keys,
+        without removing it.
+        :return:
+        """
+        key = self._best_key()
+        return key, self._heaps[key][0]
+
+    def pop(self, key):
+        """
+        Removes and returns the min/max item of `key`. Raises KeyError if
+        `key` has no items.
+        :param key:
+        :return:
+        """
+        heap = self._heaps[key]
+        item = self._heappop(heap)
+        self._size -= 1
+        if heap:
+            self._index_top(key, heap)
+        else:
+            del self._heaps[key]
+        return item
+
+    def pop_best(self):
+        """
+        Removes and returns the `(key, item)` pair with the min/max item across
+        all keys.
+        :return:
+        """
+        key = self._best_key()
+        return key, self.pop(key)
+
+    def push(self, key, item):
+        """
+        Pushes `item` onto the heap of `key`.
+        :param key: Hashable key
+        :param item:
+        :return:
+        """
+        heap = self._heaps.get(key)
+        if heap is None:
+            heap = self._heaps[key] = [item]
+        else:
+            self._heappush(heap, item)
+        self._size += 1
+        if heap[0] is item:
+            self._index_top(key, heap)
+
+    def push_many(self, key, items):
+        """
+        Pushes the elements of the iterable `items` onto the heap of `key`, see
+        `Heap.push_many`.
+        :param key: Hashable key
+        :param items: Iterable of items
+        :return:
+        """
+        items = list(items)
+        if not items:
+            return
+        heap = self._heaps.setdefault(key, [])
+        if len(items) >= len(heap):
+            heap.extend(items)
+            self._heapify(heap)
+        else:
+            for item in items:
+                self._heappush(heap, item)
+        self._size += len(items)
+        self._index_top(key, heap)
+
+    def _best_key(self):
+        """
+        Returns the key of the best top, dropping the stale entries found on
+        the way. Raises IndexError if there are no items.
+        """
+        index, heaps = self._index, self._heaps
+        if index is None:
+            index = self._index = []
+            self._rebuild_index()
+        while True:
+            top, _, key = index[0]  # index out of range error
+            heap = heaps.get(key)
+            if heap is not None and heap[0] is top:
+                return key
+            self._heappop(index)
+
+    def _index_top(self, key, heap):
+        index = self._index
+        if index is None:
+            return
+        if len(index) > 2 * len(self._heaps) + _MIN_STALE_ENTRIES:
+            self._rebuild_index()
+        else:
+            self._heappush(index, (heap[0], next(self._counter), key))
+
+    def _rebuild_index(self):
+        counter, index = self._counter, self._index
+        index[:] = [(heap[0], next(counter), key) for key, heap in self._heaps.items()]
+        self._heapify(index)
+
+
+class MinHeapMap(HeapMap):
+    __slots__ = ()
+
+
+class MaxHeapMap(HeapMap):
+    __slots__ = ()
+
+    _heapify = staticmethod(heapify_max)
+    _heappop = staticmethod(heappop_max)
+    _heappush = staticmethod(heappush_max)
+
+    # See `MaxHeap._counter`.
+    _counter = count(0, -1)
@@ -1,7 +1,86 @@
+from itertools import repeat
+
 from .minheap import MinHeap
 from .maxheap import MaxHeap
 
+# Smallest input sorted by a process pool when `workers` is given. Below that,
+# pickling the items to the workers and back costs more than it saves.
+_PARALLEL_MIN_SIZE = 100_000
+
+
+def heapsort(iterable, reverse=False, key=None, limit=None, lazy=False, workers=None):
+    """Returns the items of `iterable` in sorted order.
+
+    Building the heap costs O(n) and every item taken from it O(log n), so
+    sorting only the first k items with `limit` costs O(n + k log n). Large
+    limits sort the heap in place instead, see `Heap.pop_many`.
+    :param iterable: Items to sort
+    :param reverse: Sort in descending order
+    :param key: Function of one argument used to extract the comparison key
+    of each item
+    :param limit: Max number of items to return
+    :param lazy: Return an iterator popping the items one by one as they are
+    consumed instead of a list
+    :param workers: Number of processes sorting chunks of large inputs in
+    parallel, see `_parallel_sort`. The items and `key` must be picklable.
+    :return:
+    """
+    if limit is not None:
+        limit = max(0, limit)
+    if workers is not None and workers > 1:
+        items = list(iterable)
+        if len(items) >= _PARALLEL_MIN_SIZE:
+            items = _parallel_sort(items, reverse, key, limit, workers)
+            return iter(items) if lazy else items
+        iterable = items
+    heap = MaxHeap(iterable, key) if reverse else MinHeap(iterable, key)
+    n = len(heap) if limit is None else min(limit, len(heap))
+    if lazy:
+        return _popped(heap, n)
+    return heap.pop_many(n)
+
+
+def _parallel_sort(items, reverse, key, limit, workers):
+    """
+    Sorts `items` split in `workers` chunks, each in its own process, and
+    merges the sorted chunks. With `key`, the workers return the sorted runs
+    as `(key, item)` pairs, so it is called once per item.
+    """
+    # Imported here, it is slow to import and only needed with `workers`.
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(items) // workers)
+    chunks = [items[start : start + size] for start in range(0, len(items), size)]
+    with ProcessPoolExecutor(workers) as executor:
+        runs = executor.map(
+            _sort_chunk, chunks, repeat(reverse), repeat(key), repeat(limit)
+        )
+        merged = [entry for run in runs for entry in run]
+    # Timsort finds the sorted runs and merges them in O(n log workers), much
+    # faster than a k-way merge through `merge`. Both are stable, items with
+    # equal keys keep their input order.
+    if key is None:
+        merged.sort(reverse=reverse)
+    else:
+        merged.sort(key=_get_key, reverse=reverse)
+        merged = [entry[1] for entry in merged]
+    return merged if limit is None else merged[:limit]
+
+
+def _sort_chunk(chunk, reverse, key, limit):
+    if key is not None:
+        chunk = [(key(item), item) for item in chunk]
+        chunk.sort(key=_get_key, reverse=reverse)
+    else:
+        chunk.sort(reverse=reverse)
+    return chunk if limit is None else chunk[:limit]
+
+
+def _get_key(entry):
+    return entry[0]
+
 
-def heapsort(iterable, reverse=False):
-    heap = MaxHeap(iterable) if reverse else MinHeap(iterable)
-    return [heap.pop() for _ in range(len(heap))]
+def _popped(heap, n):
+    pop = heap.pop
+    for _ in range(n):
+        yield pop()
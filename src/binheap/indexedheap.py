@@ -0,0 +1,280 @@
+import operator
+from operator import itemgetter
+
+from ._sift import heappop, heappush
+from .heap import _SORT_FRACTION, Heap
+
+# Returns the priority of an `(item, priority)` entry.
+_get_priority = itemgetter(1)
+
+
+class IndexedHeap(Heap):
+    """Heap of unique, hashable items each ordered by a separate priority.
+
+    Elements are stored as `(item, priority)` pairs. A map from every item to
+    its position in the heap is kept up to date on every move, so membership
+    tests are O(1) and `update`, `remove` and `del heap[i]` are O(log n)
+    instead of a scan followed by a full heapify.
+    """
+
+    def __init__(self, seq=()):
+        """
+        :param seq: Mapping of item to priority or an iterable of
+        `(item, priority)` pairs. If an item repeats, the last priority wins.
+        """
+        super().__init__()
+        self._heap = list(dict(seq).items())
+        self.heapify()
+
+    def __contains__(self, item):
+        return item in self._index
+
+    def __delitem__(self, key):
+        self._remove_at(range(len(self._heap))[key])
+
+    def __getstate__(self):
+        # The index takes as much room as the heap itself and is rebuilt in
+        # O(n) from the positions on unpickling, without sifting.
+        state = self.__dict__.copy()
+        del state['_index']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._index = {item: pos for pos, (item, _) in enumerate(self._heap)}
+
+    def clear(self):
+        super().clear()
+        self._index.clear()
+
+    def discard(self, item):
+        """
+        Removes `item` from the heap if it is present, in O(log n).
+        :param item:
+        :return: True if the item was in the heap
+        """
+        pos = self._index.get(item)
+        if pos is None:
+            return False
+        self._remove_at(pos)
+        return True
+
+    def heapify(self):
+        self._index = {item: pos for pos, (item, _) in enumerate(self._heap)}
+        for pos in reversed(range(len(self._heap) // 2)):
+            self._siftup(pos)
+
+    def iter_sorted(self):
+        """
+        Yields the `(item, priority)` pairs from the min/max priority on,
+        without modifying the heap, see `Heap.iter_sorted`.
+        :return:
+        """
+        heap, lt = self._heap, self._lt
+        if not heap:
+            return
+        frontier = [(heap[0][1], 0)]
+        while frontier:
+            _, pos = heappop(frontier, lt)
+            for child in self._children(pos, len(heap)):
+                heappush(frontier, (heap[child][1], child), lt)
+            yield heap[pos]
+
+    def pop(self):
+        """
+        Removes and returns the `(item, priority)` pair with the min/max
+        priority.
+        :return:
+        """
+        heap = self._heap
+        last = heap.pop()  # index out of range error
+        del self._index[last[0]]
+        if not heap:
+            return last
+        top, heap[0] = heap[0], last
+        del self._index[top[0]]
+        self._siftup(0)
+        return top
+
+    def pop_many(self, k):
+        """
+        Removes and returns the k `(item, priority)` pairs with the min/max
+        priorities, in order. Large batches sort the heap by priority and
+        re-index what is left, see `Heap.pop_many`.
+        :param k: Number of pairs to pop. All of them if k >= len(heap).
+        :return:
+        """
+        heap = self._heap
+        k = min(max(k, 0), len(heap))
+        if not self._can_sort(heap) or k < len(heap) * _SORT_FRACTION:
+            return [self.pop() for _ in range(k)]
+        heap.sort(key=_get_priority, reverse=self._reverse)
+        popped = heap[:k]
+        del heap[:k]
+        self._index = {item: pos for pos, (item, _) in enumerate(heap)}
+        return popped
+
+    def priority(self, item):
+        """
+        Returns the priority of `item`. Raises KeyError if it isn't in the heap.
+        :param item:
+        :return:
+        """
+        return self._heap[self._index[item]][1]
+
+    def push(self, item, priority):
+        """Push `item` with the given priority onto the heap.
+
+        If `item` is already in the heap, its priority is updated instead.
+        :param item: Hashable item
+        :param priority: Priority of the item
+        :return:
+        """
+        pos = self._index.get(item)
+        if pos is not None:
+            self._set_priority(pos, priority)
+            return
+        heap = self._heap
+        heap.append((item, priority))
+        self._siftdown(0, len(heap) - 1)
+
+    def push_many(self, pairs):
+        """Push `(item, priority)` pairs onto the heap.
+
+        Like `push`, items already in the heap get their priority updated. The
+        heap is rebuilt in O(n + k) once the batch is at least as large as it.
+        :param pairs: Mapping of item to priority or an iterable of
+        `(item, priority)` pairs
+        :return:
+        """
+        pairs = dict(pairs)
+        if len(pairs) >= len(self._heap):
+            merged = dict(self._heap)
+            merged.update(pairs)
+            self._heap = list(merged.items())
+            self.heapify()
+        else:
+            for item, priority in pairs.items():
+                self.push(item, priority)
+
+    def push_pop(self, item, priority):
+        """
+        Pushes `item` and then pops the `(item, priority)` pair with the
+        min/max priority, more efficiently than `push` followed by `pop`.
+        :return:
+        """
+        if item in self._index:
+            self.push(item, priority)
+            return self.pop()
+        heap = self._heap
+        if heap and self._lt(heap[0][1], priority):
+            top, heap[0] = heap[0], (item, priority)
+            del self._index[top[0]]
+            self._siftup(0)
+            return top
+        return item, priority
+
+    def remove(self, item):
+        """
+        Removes `item` from the heap and returns its priority. Raises KeyError
+        if it isn't in the heap.
+        :param item:
+        :return:
+        """
+        pos = self._index[item]
+        return self._remove_at(pos)[1]
+
+    def replace(self, item, priority):
+        """
+        Pops the `(item, priority)` pair with the min/max priority and then
+        pushes `item`, more efficiently than `pop` followed by `push`.
+        :return:
+        """
+        if item in self._index:
+            top = self.pop()
+            self.push(item, priority)
+            return top
+        heap = self._heap
+        top = heap[0]  # index out of range error
+        heap[0] = (item, priority)
+        del self._index[top[0]]
+        self._siftup(0)
+        return top
+
+    def update(self, item, priority):
+        """
+        Changes the priority of `item`. Raises KeyError if it isn't in the heap.
+        :param item:
+        :param priority: New priority of the item
+        :return:
+        """
+        self._set_priority(self._index[item], priority)
+
+    def _can_meld(self, other):
+        # Entries can't be moved without their positions.
+        return False
+
+    def _remove_at(self, pos):
+        heap = self._heap
+        last = heap.pop()
+        if pos == len(heap):
+            del self._index[last[0]]
+            return last
+        removed, heap[pos] = heap[pos], last
+        del self._index[removed[0]]
+        self._siftdown(0, pos)
+        self._siftup(self._index[last[0]])
+        return removed
+
+    def _set_priority(self, pos, priority):
+        item = self._heap[pos][0]
+        self._heap[pos] = (item, priority)
+        self._siftdown(0, pos)
+        self._siftup(self._index[item])
+
+    # The sift functions follow the naming used by `heapq`: `_siftdown` moves
+    # an entry towards the root and `_siftup` moves it towards the leaves.
+
+    def _siftdown(self, startpos, pos):
+        heap, index, lt = self._heap, self._index, self._lt
+        entry = heap[pos]
+        priority = entry[1]
+        while pos > startpos:
+            parentpos = (pos - 1) >> 1
+            parent = heap[parentpos]
+            if not lt(priority, parent[1]):
+                break
+            heap[pos] = parent
+            index[parent[0]] = pos
+            pos = parentpos
+        heap[pos] = entry
+        index[entry[0]] = pos
+
+    def _siftup(self, pos):
+        heap, index, lt = self._heap, self._index, self._lt
+        endpos = len(heap)
+        entry = heap[pos]
+        priority = entry[1]
+        childpos = 2 * pos + 1
+        while childpos < endpos:
+            rightpos = childpos + 1
+            if rightpos < endpos and lt(heap[rightpos][1], heap[childpos][1]):
+                childpos = rightpos
+            child = heap[childpos]
+            if not lt(child[1], priority):
+                break
+            heap[pos] = child
+            index[child[0]] = pos
+            pos = childpos
+            childpos = 2 * pos + 1
+        heap[pos] = entry
+        index[entry[0]] = pos
+
+
+class IndexedMinHeap(IndexedHeap):
+    pass
+
+
+class IndexedMaxHeap(IndexedHeap):
+    _lt = staticmethod(operator.gt)
+    _reverse = True
@@ -1,10 +1,40 @@
 from __future__ import annotations
 
+import operator
+from itertools import count
 from typing import Any
 
 from .heap import Heap
 
-
+# Max-heap counterparts of the heapq functions. They store the values as they
+# are and only use `<` to compare them, like heapq does. Python 3.14 made them
+# public; earlier versions have C implementations of all but the push functions
+# under private names.
+try:
+    from heapq import (
+        heapify_max,
+        heappop_max,
+        heappush_max,
+        heappushpop_max,
+        heapreplace_max,
+    )
+except ImportError:
+    from heapq import _heapify_max as heapify_max
+    from heapq import _heappop_max as heappop_max
+    from heapq import _heapreplace_max as heapreplace_max
+    from heapq import _siftdown_max
+
+    def heappush_max(heap, item):
+        heap.append(item)
+        _siftdown_max(heap, 0, len(heap) - 1)
+
+    def heappushpop_max(heap, item):
+        if heap and item < heap[0]:
+            return heapreplace_max(heap, item)
+        return item
+
+
+# Kept for backwards compatibility, MaxHeap no longer wraps its elements.
 class Inverted:
     __slots__ = ('_val',)
 
@@ -42,37 +72,23 @@ def uninvert(obj: Inverted) -> Any:
 
 
 class MaxHeap(Heap):
-    def __init__(self, seq=()):
-        super().__init__(invert(item) for item in seq)
-
-    def __contains__(self, item):
-        return invert(item) in self._heap
-
-    def __getitem__(self, item):
-        if isinstance(item, slice):
-            return [uninvert(item) for item in self._heap[item]]
-        return uninvert(self._heap[item])
-
-    def __iter__(self):
-        return (uninvert(item) for item in self._heap)
-
-    def peek(self):
-        return uninvert(super().peek())
-
-    def pop(self):
-        return uninvert(super().pop())
-
-    def push(self, items):
-        try:
-            super().push(invert(item) for item in items)
-        except TypeError:
-            super().push(invert(items))
-
-    def push_pop(self, item):
-        return uninvert(super().push_pop(invert(item)))
-
-    def replace(self, item):
-        return uninvert(super().replace(invert(item)))
-
-    def to_list(self):
-        return [uninvert(item) for item in super().to_list()]
+    _heapify = staticmethod(heapify_max)
+    _heappop = staticmethod(heappop_max)
+    _heappush = staticmethod(heappush_max)
+    _heappushpop = staticmethod(heappushpop_max)
+    _heapreplace = staticmethod(heapreplace_max)
+    _lt = staticmethod(operator.gt)
+    _reverse = True
+
+    # Keyed entries are max-ordered too, so count downwards to pop equal keys
+    # in insertion order.
+    _counter = count(0, -1)
+
+    def __setstate__(self, state):
+        inverted = '_key' not in state
+        super().__setstate__(state)
+        if inverted:
+            # Pickled by a version wrapping the elements in `Inverted`.
+            heap = self._heap
+            heap[:] = map(uninvert, heap)
+            self._heapify(heap)
@@ -0,0 +1,16 @@
+import heapq
+
+
+def merge(*iterables, key=None, reverse=False):
+    """Merges sorted iterables into a single sorted iterator.
+
+    The iterables are consumed lazily, only their current heads are kept in
+    memory. Descending inputs are merged with `reverse=True`, directly and
+    without wrapping their items.
+    :param iterables: Iterables, each sorted by `key` in the same order
+    :param key: Function of one argument used to extract the comparison key
+    of each item
+    :param reverse: True if the iterables are sorted in descending order
+    :return:
+    """
+    return heapq.merge(*iterables, key=key, reverse=reverse)
@@ -0,0 +1,257 @@
+from itertools import count
+from operator import gt, lt
+
+from .heap import _advance_counter
+
+
+def _is_min_level(pos):
+    # The root is on level 0 and level k starts at position 2**k - 1.
+    return (pos + 1).bit_length() & 1 == 1
+
+
+class MinMaxHeap:
+    """Double-ended heap with O(1) access to both its min and max elements.
+
+    Elements are stored in a single list where nodes on even levels are
+    smaller than all their descendants and nodes on odd levels larger, so
+    the min is the root and the max one of its children. Pushes and pops from
+    either end are O(log n) and building from a sequence is O(n).
+    """
+
+    # See `Heap._counter`.
+    _counter = count()
+
+    def __init__(self, seq=(), key=None, capacity=None, evict='max'):
+        """
+        :param seq: Initial items of the heap
+        :param key: See `Heap`
+        :param capacity: Max number of items. Once full, every push evicts an
+        item from the `evict` end, which is the pushed item itself if it
+        belongs beyond that end.
+        :param evict: 'max' to keep the `capacity` smallest items, 'min' to
+        keep the largest ones
+        """
+        if capacity is not None and capacity < 0:
+            raise ValueError('capacity must be non-negative')
+        if evict not in ('min', 'max'):
+            raise ValueError("evict must be 'min' or 'max'")
+        self._key = key
+        self._capacity = capacity
+        self._evict_max = evict == 'max'
+        self._heap = []
+        self.push_many(seq)
+
+    def __contains__(self, item):
+        return item in iter(self)
+
+    def __iter__(self):
+        """
+        Yields the items in no particular order.
+        """
+        if self._key is None:
+            return iter(self._heap)
+        return (entry[2] for entry in self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._key is not None:
+            _advance_counter(type(self), [entry[1] for entry in self._heap])
+
+    def __str__(self):
+        return str(self.to_list())
+
+    def __repr__(self):
+        items = self.to_list()
+        return f'{self.__class__.__name__}({items if items else ""})'
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def clear(self):
+        self._heap.clear()
+
+    def peek_max(self):
+        """
+        Returns the max element without removing it.
+        :return:
+        """
+        return self._item(self._heap[self._max_pos()])
+
+    def peek_min(self):
+        """
+        Returns the min element without removing it.
+        :return:
+        """
+        return self._item(self._heap[0])  # index out of range error
+
+    def pop_max(self):
+        """
+        Removes and returns the max element.
+        :return:
+        """
+        return self._item(self._pop_at(self._max_pos()))
+
+    def pop_min(self):
+        """
+        Removes and returns the min element.
+        :return:
+        """
+        if not self._heap:
+            raise IndexError('pop from empty heap')
+        return self._item(self._pop_at(0))
+
+    def push(self, items):
+        """Push items onto the heap.
+
+        - If `items` is an iterable then elements of the iterable are pushed
+        individually, see `push_many`.
+        - If `items` isn't an iterable then it is pushed as a single item.
+        :param items: Single item or an iterable
+        :return:
+        """
+        try:
+            iter(items)
+        except TypeError:
+            self._push_entry(self._entry(items))
+        else:
+            self.push_many(items)
+
+    def push_many(self, items):
+        """
+        Push elements of the iterable `items` onto the heap. The heap is
+        rebuilt in O(n + k) once the batch is at least as large as it, see
+        `Heap.push_many`.
+        :param items: Iterable of items
+        :return:
+        """
+        heap, capacity = self._heap, self._capacity
+        if self._key is None:
+            entries = list(items)
+        else:
+            items = list(items)
+            entries = list(zip(map(self._key, items), self._counter, items))
+        if len(entries) >= len(heap):
+            heap.extend(entries)
+            self._heapify()
+            if capacity is not None:
+                pop = self._pop_at
+                while len(heap) > capacity:
+                    pop(self._max_pos() if self._evict_max else 0)
+        else:
+            for entry in entries:
+                self._push_entry(entry)
+
+    def to_list(self):
+        return list(self)
+
+    def _entry(self, item):
+        # See `Heap._entry`.
+        if self._key is None:
+            return item
+        return self._key(item), next(self._counter), item
+
+    def _heapify(self):
+        heap = self._heap
+        for pos in reversed(range(len(heap) // 2)):
+            self._trickle_down(pos)
+
+    def _item(self, entry):
+        return entry if self._key is None else entry[2]
+
+    def _max_pos(self):
+        heap = self._heap
+        if len(heap) <= 2:
+            if not heap:
+                raise IndexError('peek from empty heap')
+            return len(heap) - 1
+        return 1 if heap[2] < heap[1] else 2
+
+    def _pop_at(self, pos):
+        heap = self._heap
+        last = heap.pop()
+        if pos == len(heap):
+            return last
+        entry, heap[pos] = heap[pos], last
+        self._trickle_down(pos)
+        return entry
+
+    def _push_entry(self, entry):
+        heap, capacity = self._heap, self._capacity
+        if capacity is not None and len(heap) >= capacity:
+            if not heap:
+                return
+            if self._evict_max:
+                pos = self._max_pos()
+                if not entry < heap[pos]:
+                    return
+            else:
+                pos = 0
+                if not heap[0] < entry:
+                    return
+            self._pop_at(pos)
+        heap.append(entry)
+        self._bubble_up(len(heap) - 1)
+
+    def _bubble_up(self, pos):
+        if not pos:
+            return
+        heap = self._heap
+        parent = (pos - 1) >> 1
+        before = lt if _is_min_level(pos) else gt
+        if before(heap[parent], heap[pos]):
+            heap[pos], heap[parent] = heap[parent], heap[pos]
+            self._bubble_up_grandparents(parent, gt if before is lt else lt)
+        else:
+            self._bubble_up_grandparents(pos, before)
+
+    def _bubble_up_grandparents(self, pos, before):
+        """
+        Moves `heap[pos]` up through the levels of the same kind as its own,
+        where `before(a, b)` is True if `a` belongs above `b`.
+        """
+        heap = self._heap
+        entry = heap[pos]
+        while pos > 2:
+            grandparent = (pos - 3) >> 2
+            if not before(entry, heap[grandparent]):
+                break
+            heap[pos] = heap[grandparent]
+            pos = grandparent
+        heap[pos] = entry
+
+    def _trickle_down(self, pos):
+        """
+        Moves `heap[pos]` down until the heap is valid again, comparing it to
+        its children and grandchildren.
+        """
+        heap = self._heap
+        size = len(heap)
+        before = lt if _is_min_level(pos) else gt
+        while True:
+            first_child = 2 * pos + 1
+            if first_child >= size:
+                return
+            # Best of the up to two children and four grandchildren.
+            best = first_child
+            if first_child + 1 < size and before(heap[first_child + 1], heap[best]):
+                best = first_child + 1
+            first_grandchild = 2 * first_child + 1
+            for candidate in range(first_grandchild, min(first_grandchild + 4, size)):
+                if before(heap[candidate], heap[best]):
+                    best = candidate
+            if best >= first_grandchild:
+                if not before(heap[best], heap[pos]):
+                    return
+                heap[pos], heap[best] = heap[best], heap[pos]
+                parent = (best - 1) >> 1
+                if before(heap[parent], heap[best]):
+                    heap[parent], heap[best] = heap[best], heap[parent]
+                pos = best
+            else:
+                if before(heap[best], heap[pos]):
+                    heap[pos], heap[best] = heap[best], heap[pos]
+                return
@@ -0,0 +1,151 @@
+import operator
+import sys
+from array import array
+from functools import lru_cache
+
+from ._sift import heapify, heappop, heappush, heappushpop, heapreplace
+from .heap import Heap
+
+# Smallest heap for which bulk operations are handed over to NumPy.
+_NUMPY_MIN_SIZE = 1024
+
+# `pop_many(k)` sorts the whole buffer with NumPy instead of popping k times
+# once k is at least this fraction of the heap.
+_SORT_FRACTION = 1 / 32
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """
+    Returns the numpy module, or None if it isn't installed. It is slow to
+    import, so only imported once a heap is large enough to use it.
+    """
+    try:
+        import numpy
+    except ImportError:  # optional, only speeds up bulk operations
+        return None
+    return numpy
+
+
+class NumericHeap(Heap):
+    """Heap of numbers stored unboxed in a typed `array.array`.
+
+    Each element takes `itemsize` bytes (8 for the default 'd' typecode)
+    instead of a pointer plus a full int/float object. If NumPy is installed,
+    heapify and large `pop_many` calls sort the buffer in place, a sorted array
+    being a valid heap.
+    """
+
+    def __init__(self, seq=(), typecode='d', capacity=None):
+        """
+        :param seq: Initial numbers of the heap
+        :param typecode: `array.array` typecode of the numbers
+        :param capacity: See `Heap`
+        """
+        self._typecode = typecode
+        super().__init__(seq, capacity=capacity)
+
+    def __buffer__(self, flags):
+        return self.view()
+
+    def __getitem__(self, item):
+        if self._n_removed:
+            self._compact()
+        if isinstance(item, slice):
+            return self._heap[item].tolist()
+        return self._heap[item]
+
+    def __release_buffer__(self, view):
+        view.release()
+
+    def clear(self):
+        self._reset_removed()
+        del self._heap[:]
+
+    def pop_many(self, k):
+        """
+        Removes and returns the k min/max elements from the heap, in order.
+        :param k: Number of elements to pop. All of them if k >= len(heap).
+        :return:
+        """
+        if self._removed is not None:
+            self._compact()
+            self._reset_removed()
+        heap = self._heap
+        k = min(k, len(heap))
+        if self._can_sort(heap) and k >= len(heap) * _SORT_FRACTION:
+            self._sort(heap)
+            popped = heap[:k].tolist()
+            del heap[:k]
+            return popped
+        heappop = self._heappop
+        return [heappop(heap) for _ in range(k)]
+
+    def to_list(self):
+        if self._n_removed:
+            self._compact()
+        return self._heap.tolist()
+
+    def view(self):
+        """
+        Returns a read-only memoryview of the numbers in heap order, without
+        copying them. It can be passed to anything taking a buffer, e.g.
+        `numpy.frombuffer` or `socket.send`. The heap can't grow or shrink
+        while the view is alive, pushes and pops raise BufferError until it is
+        released. Requires Python 3.8 or later.
+        :return:
+        """
+        if sys.version_info < (3, 8):
+            raise RuntimeError('read-only views require Python 3.8 or later')
+        if self._n_removed:
+            self._compact()
+        return memoryview(self._heap).toreadonly()
+
+    @property
+    def typecode(self):
+        return self._typecode
+
+    def _can_meld(self, other):
+        return super()._can_meld(other) and other._typecode == self._typecode
+
+    def _entries(self, items):
+        return array(self._typecode, items)
+
+    def _heapify(self, heap):
+        if self._can_sort(heap):
+            self._sort(heap)
+        else:
+            heapify(heap, len(heap), self._lt)
+
+    def _heappop(self, heap):
+        return heappop(heap, self._lt)
+
+    def _heappush(self, heap, item):
+        heappush(heap, item, self._lt)
+
+    def _heappushpop(self, heap, item):
+        return heappushpop(heap, item, self._lt)
+
+    def _heapreplace(self, heap, item):
+        return heapreplace(heap, item, self._lt)
+
+    @staticmethod
+    def _can_sort(heap):
+        return len(heap) >= _NUMPY_MIN_SIZE and _numpy() is not None
+
+    def _sort(self, heap):
+        # The view must not outlive this call, arrays can't be resized while
+        # their buffer is exported.
+        view = _numpy().frombuffer(heap, dtype=heap.typecode)
+        if self._reverse:
+            view = view[::-1]
+        view.sort()
+
+
+class NumericMinHeap(NumericHeap):
+    pass
+
+
+class NumericMaxHeap(NumericHeap):
+    _lt = staticmethod(operator.gt)
+    _reverse = True
@@ -0,0 +1,307 @@
+import operator
+from itertools import count
+
+from .heap import _advance_counter
+
+
+class PairingNode:
+    """Handle of an item inserted into a PairingHeap.
+
+    Nodes are linked as a binary tree: `_child` is the first child and
+    `_next` the next sibling. `_prev` is the previous sibling, or the parent
+    for a first child.
+    """
+
+    __slots__ = ('_entry', '_child', '_next', '_prev')
+
+    def __init__(self, entry):
+        self._entry = entry
+        self._child = self._next = self._prev = None
+
+
+class PairingHeap:
+    """Pairing heap with the push/pop/peek API of MinHeap and MaxHeap.
+
+    Inserting and melding are O(1) and popping is O(log n) amortized. `insert`
+    returns a handle that `update` and `remove` take, moving an item towards
+    the root is O(log n) amortized and cheap in practice.
+    """
+
+    # Returns True if the first element must be closer to the root.
+    _lt = staticmethod(operator.lt)
+
+    # See `Heap._counter`.
+    _counter = count()
+
+    def __init__(self, seq=(), key=None):
+        """
+        :param seq: Initial items of the heap
+        :param key: See `Heap`
+        """
+        self._key = key
+        self._root = None
+        self._size = 0
+        self.push_many(seq)
+
+    def __contains__(self, item):
+        return item in iter(self)
+
+    def __iter__(self):
+        """
+        Yields the items in no particular order.
+        """
+        return map(self._item, self._entries())
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        # Pickling the nodes themselves recurses once per sibling, the entries
+        # are stored as a flat list instead and re-linked on unpickling.
+        return self._key, list(self._entries())
+
+    def __setstate__(self, state):
+        self._key, entries = state
+        self._root = None
+        self._size = 0
+        if self._key is not None:
+            _advance_counter(type(self), [entry[1] for entry in entries])
+        for entry in entries:
+            self._insert_node(PairingNode(entry))
+
+    def __str__(self):
+        return str(self.to_list())
+
+    def __repr__(self):
+        items = self.to_list()
+        return f'{self.__class__.__name__}({items if items else ""})'
+
+    def clear(self):
+        self._root = None
+        self._size = 0
+
+    def insert(self, item):
+        """
+        Pushes a single item onto the heap and returns its node, to be passed
+        to `update` or `remove` while the item is in the heap.
+        :param item:
+        :return:
+        """
+        node = PairingNode(self._entry(item))
+        self._insert_node(node)
+        return node
+
+    def meld(self, other):
+        """
+        Moves all the items of `other` into this heap, leaving it empty. This
+        is O(1) if both heaps have the same type and key function.
+        :param other: Heap to meld into this one
+        :return:
+        """
+        if other is self:
+            return
+        if type(other) is type(self) and other._key is self._key:
+            if other._root is not None:
+                if self._root is None:
+                    self._root = other._root
+                else:
+                    self._root = self._link(self._root, other._root)
+                self._size += other._size
+        else:
+            self.push_many(other)
+        other.clear()
+
+    @classmethod
+    def merge(cls, *heaps, **kwargs):
+        """
+        Returns a new heap holding the items of all `heaps`, which are left
+        untouched.
+        :param heaps: Heaps to merge
+        :param kwargs: Arguments of the new heap
+        :return:
+        """
+        merged = cls(**kwargs)
+        for heap in heaps:
+            merged.push_many(heap)
+        return merged
+
+    def peek(self):
+        """
+        Returns the min/max element from the heap without removing it.
+        :return:
+        """
+        if self._root is None:
+            raise IndexError('peek from empty heap')
+        return self._item(self._root._entry)
+
+    def pop(self):
+        """
+        Removes and returns the min/max element from the heap.
+        :return:
+        """
+        root = self._root
+        if root is None:
+            raise IndexError('pop from empty heap')
+        self._root = self._pair(root._child)
+        root._child = None
+        self._size -= 1
+        return self._item(root._entry)
+
+    def push(self, items):
+        """Push items onto the heap.
+
+        - If `items` is an iterable then elements of the iterable are pushed
+        individually.
+        - If `items` isn't an iterable then it is pushed as a single item.
+        :param items: Single item or an iterable
+        :return:
+        """
+        try:
+            iter(items)
+        except TypeError:
+            self.insert(items)
+        else:
+            self.push_many(items)
+
+    def push_many(self, items):
+        insert = self.insert
+        for item in items:
+            insert(item)
+
+    def push_pop(self, item):
+        entry = self._entry(item)
+        if self._root is None or not self._lt(self._root._entry, entry):
+            return item
+        top = self.pop()
+        self._insert_node(PairingNode(entry))
+        return top
+
+    def remove(self, node):
+        """
+        Removes the item of `node` from the heap and returns it.
+        :param node: Node returned by `insert`
+        :return:
+        """
+        if node is self._root:
+            return self.pop()
+        self._cut(node)
+        subtree = self._pair(node._child)
+        node._child = None
+        if subtree is not None:
+            self._root = self._link(self._root, subtree)
+        self._size -= 1
+        return self._item(node._entry)
+
+    def replace(self, item):
+        top = self.pop()
+        self.insert(item)
+        return top
+
+    def to_list(self):
+        return list(self)
+
+    def update(self, node, item):
+        """
+        Replaces the item of `node`. This is fast if the new item belongs
+        closer to the root than the old one (decrease-key in a min heap).
+        :param node: Node returned by `insert`
+        :param item: New item
+        :return:
+        """
+        entry = self._entry(item)
+        if self._lt(node._entry, entry):
+            self.remove(node)
+            node._entry = entry
+            self._insert_node(node)
+            return
+        node._entry = entry
+        if node is not self._root:
+            self._cut(node)
+            self._root = self._link(self._root, node)
+
+    def _cut(self, node):
+        """
+        Detaches the subtree rooted at `node`, which mustn't be the root.
+        """
+        prev, next_ = node._prev, node._next
+        if prev._child is node:
+            prev._child = next_
+        else:
+            prev._next = next_
+        if next_ is not None:
+            next_._prev = prev
+        node._prev = node._next = None
+
+    def _entry(self, item):
+        # See `Heap._entry`.
+        if self._key is None:
+            return item
+        return self._key(item), next(self._counter), item
+
+    def _entries(self):
+        """
+        Yields the entries of all the nodes, depth first.
+        """
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node._entry
+            if node._next is not None:
+                stack.append(node._next)
+            if node._child is not None:
+                stack.append(node._child)
+
+    def _insert_node(self, node):
+        self._root = node if self._root is None else self._link(self._root, node)
+        self._size += 1
+
+    def _item(self, entry):
+        return entry if self._key is None else entry[2]
+
+    def _link(self, first, second):
+        """
+        Makes the detached root that belongs after the other one its first
+        child and returns the new root.
+        """
+        if self._lt(second._entry, first._entry):
+            first, second = second, first
+        child = first._child
+        second._next = child
+        if child is not None:
+            child._prev = second
+        second._prev = first
+        first._child = second
+        return first
+
+    def _pair(self, node):
+        """
+        Links the sibling list starting at `node` into a single tree using
+        the two-pass pairing, and returns its root.
+        """
+        if node is None:
+            return None
+        link, pairs = self._link, []
+        while node is not None:
+            first, second = node, node._next
+            if second is None:
+                first._prev = None
+                pairs.append(first)
+                break
+            node = second._next
+            first._prev = first._next = second._prev = second._next = None
+            pairs.append(link(first, second))
+        root = pairs.pop()
+        while pairs:
+            root = link(pairs.pop(), root)
+        return root
+
+
+class PairingMinHeap(PairingHeap):
+    pass
+
+
+class PairingMaxHeap(PairingHeap):
+    _lt = staticmethod(operator.gt)
+
+    # See `MaxHeap._counter`.
+    _counter = count(0, -1)
@@ -0,0 +1,187 @@
+from collections import Counter, deque
+from math import floor
+
+from .maxheap import MaxHeap
+from .minheap import MinHeap
+
+
+class RunningQuantile:
+    """Quantile of a stream of numbers, updated in O(log n) per number.
+
+    The numbers are split between a MaxHeap of the lower ones and a MinHeap
+    of the upper ones, sized so that the quantile lies between their tops.
+    Numbers are removed lazily with `discard`, which makes sliding windows
+    O(log n) per number too. The quantile is interpolated linearly between
+    the closest ranks, like `numpy.quantile` does by default.
+    """
+
+    def __init__(self, q, seq=(), window=None):
+        """
+        :param q: Quantile to track, between 0 and 1
+        :param seq: Initial numbers
+        :param window: Only track the last `window` numbers added, all of
+        them if None
+        """
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1')
+        if window is not None and window < 1:
+            raise ValueError('window must be at least 1')
+        self._q = q
+        self._low, self._high = MaxHeap(), MinHeap()
+        self._window = None if window is None else deque()
+        self._window_size = window
+        # Numbers removed with `remove` but still in the window, skipped when
+        # they fall out of it, like the heaps do with `discard`.
+        self._removed = Counter()
+        self._n_removed = 0
+        self.add_many(seq)
+
+    def __len__(self):
+        return len(self._low) + len(self._high)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._q}, {len(self)} numbers)'
+
+    @property
+    def q(self):
+        return self._q
+
+    @property
+    def value(self):
+        """
+        The current quantile. Raises IndexError if there are no numbers.
+        """
+        low, high = self._low, self._high
+        if not low:
+            raise IndexError('quantile of no numbers')
+        position = self._q * (len(self) - 1)
+        fraction = position - floor(position)
+        lower = low.peek()
+        if not fraction:
+            return lower
+        return lower + (high.peek() - lower) * fraction
+
+    def add(self, number):
+        """
+        Adds a single number.
+        :param number:
+        :return:
+        """
+        low = self._low
+        if low and number <= low.peek():
+            low.push(number)
+        else:
+            self._high.push(number)
+        self._track((number,))
+        self._rebalance()
+
+    def add_many(self, numbers):
+        """
+        Adds the numbers of the iterable `numbers`. A batch at least as large
+        as the numbers tracked so far is sorted together with them in a single
+        pass instead.
+        :param numbers: Iterable of numbers
+        :return:
+        """
+        batch = list(numbers)
+        window = self._window_size
+        if window is not None and len(batch) > window:
+            # The older ones would be removed right away.
+            self.clear()
+            batch = batch[-window:]
+        if len(batch) >= len(self):
+            numbers = batch + list(self._low) + list(self._high)
+            numbers.sort()
+            split = self._low_size(len(numbers))
+            self._low = MaxHeap(numbers[:split])
+            self._high = MinHeap(numbers[split:])  # already a valid heap
+        else:
+            pivot = self._low.peek()
+            self._low.push_many(number for number in batch if number <= pivot)
+            self._high.push_many(number for number in batch if number > pivot)
+        self._track(batch)
+        self._rebalance()
+
+    def clear(self):
+        self._low.clear()
+        self._high.clear()
+        if self._window is not None:
+            self._window.clear()
+            self._removed.clear()
+            self._n_removed = 0
+
+    def remove(self, number):
+        """
+        Removes one occurrence of `number`, the oldest one with a window.
+        Raises ValueError if it isn't tracked.
+        :param number:
+        :return:
+        """
+        if not self._discard(number):
+            raise ValueError(f'{number!r} is not tracked')
+        window = self._window
+        if window is not None:
+            self._removed[number] += 1
+            self._n_removed += 1
+            if self._n_removed > len(window) // 2:
+                self._compact()
+        self._rebalance()
+
+    def _compact(self):
+        removed = self._removed
+        numbers = []
+        for number in self._window:
+            if removed[number]:
+                removed[number] -= 1
+            else:
+                numbers.append(number)
+        self._window = deque(numbers)
+        removed.clear()
+        self._n_removed = 0
+
+    def _discard(self, number):
+        low = self._low
+        if low and number <= low.peek() and low.discard(number):
+            return True
+        return self._high.discard(number)
+
+    def _low_size(self, size):
+        # The lower heap holds the numbers up to the rank just below the
+        # quantile, its top is the lower bound of the interpolation.
+        return floor(self._q * (size - 1)) + 1 if size else 0
+
+    def _rebalance(self):
+        low, high = self._low, self._high
+        size = self._low_size(len(self))
+        while len(low) > size:
+            high.push(low.pop())
+        while len(low) < size:
+            low.push(high.pop())
+
+    def _track(self, numbers):
+        """
+        Records the numbers just added for the sliding window and removes the
+        ones that fell out of it.
+        """
+        window = self._window
+        if window is None:
+            return
+        window.extend(numbers)
+        removed = self._removed
+        while len(window) - self._n_removed > self._window_size:
+            number = window.popleft()
+            if removed[number]:
+                removed[number] -= 1
+                self._n_removed -= 1
+            else:
+                self._discard(number)
+
+
+class RunningMedian(RunningQuantile):
+    """Median of a stream of numbers, see `RunningQuantile`."""
+
+    def __init__(self, seq=(), window=None):
+        super().__init__(0.5, seq, window)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self)} numbers)'
@@ -0,0 +1,240 @@
+import multiprocessing
+import operator
+import struct
+from array import array
+
+from ._sift import siftdown, siftup
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+# Size, capacity, typecode and order of the heap, followed by the numbers
+# starting at `_DATA_OFFSET`, which is aligned for every typecode.
+_HEADER = struct.Struct('qqcc')
+_DATA_OFFSET = 24
+
+
+def _attach(name):
+    """
+    Opens an existing shared memory block without tracking it, the process
+    that created it is responsible for unlinking it.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13 it is always tracked. Processes started by
+        # multiprocessing share the tracker of their parent, which already
+        # tracks the block, so this is harmless for them.
+        return shared_memory.SharedMemory(name)
+
+
+class SharedNumericHeap:
+    """Fixed-capacity numeric heap living in a shared memory block.
+
+    Several processes can push onto and pop from the same heap: the numbers
+    and the heap size are stored in the block, and every operation holds a
+    `multiprocessing.Lock`. Pass the heap itself as an argument of the worker
+    processes, or call `attach` with its name and the same lock.
+    """
+
+    # Returns True if the first value must be closer to the root.
+    _lt = staticmethod(operator.lt)
+    _order = b'<'
+
+    def __init__(self, capacity, typecode='d', lock=None, name=None):
+        """
+        :param capacity: Max number of elements
+        :param typecode: `array.array` typecode of the numbers
+        :param lock: Lock shared by all the processes using the heap, a new
+        `multiprocessing.Lock` if None
+        :param name: Name of the shared memory block, generated if None
+        """
+        if shared_memory is None:
+            raise RuntimeError('shared memory requires Python 3.8 or later')
+        if capacity < 0:
+            raise ValueError('capacity must be non-negative')
+        itemsize = array(typecode).itemsize
+        shm = shared_memory.SharedMemory(
+            name, create=True, size=_DATA_OFFSET + max(capacity, 1) * itemsize
+        )
+        try:
+            _HEADER.pack_into(shm.buf, 0, 0, capacity, typecode.encode(), self._order)
+            self._open(shm, lock)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name, lock):
+        """
+        Returns the heap stored in the existing shared memory block `name`.
+        :param name: `name` of the heap
+        :param lock: Lock the heap was created with
+        :return:
+        """
+        heap = cls.__new__(cls)
+        shm = _attach(name)
+        try:
+            if _HEADER.unpack_from(shm.buf)[3] != cls._order:
+                raise ValueError(f'{name} is not a {cls.__name__}')
+            heap._open(shm, lock)
+        except BaseException:
+            shm.close()
+            raise
+        return heap
+
+    def __del__(self):
+        # SharedMemory can't close the block while the views on it are alive,
+        # they must be released first if the heap wasn't closed.
+        if hasattr(self, '_shm'):
+            self.close()
+
+    def __reduce__(self):
+        return self.__class__.attach, (self.name, self._lock)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._header[0]
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.to_list() if len(self) else ""})'
+
+    @property
+    def capacity(self):
+        return self._header[1]
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def typecode(self):
+        return self._data.format
+
+    def clear(self):
+        with self._lock:
+            self._header[0] = 0
+
+    def close(self):
+        """
+        Detaches this process from the heap. Other processes can keep using it.
+        :return:
+        """
+        self._data.release()
+        self._header.release()
+        self._shm.close()
+
+    def peek(self):
+        with self._lock:
+            if not self._header[0]:
+                raise IndexError('peek from empty heap')
+            return self._data[0]
+
+    def pop(self):
+        with self._lock:
+            return self._pop()
+
+    def pop_many(self, k):
+        """
+        Removes and returns up to k min/max elements in order, under a single
+        lock acquisition.
+        :param k: Max number of elements to pop
+        :return:
+        """
+        with self._lock:
+            return [self._pop() for _ in range(min(k, self._header[0]))]
+
+    def push(self, items):
+        """Push items onto the heap. Raises IndexError if it is full.
+
+        - If `items` is an iterable then elements of the iterable are pushed
+        individually, under a single lock acquisition.
+        - If `items` isn't an iterable then it is pushed as a single item.
+        :param items: Single item or an iterable
+        :return:
+        """
+        try:
+            items = list(items)
+        except TypeError:
+            items = [items]
+        with self._lock:
+            header, data = self._header, self._data
+            size = header[0]
+            if size + len(items) > header[1]:
+                raise IndexError('push onto full heap')
+            for item in items:
+                data[size] = item
+                siftdown(data, 0, size, self._lt)
+                size += 1
+                header[0] = size
+
+    def push_pop(self, item):
+        with self._lock:
+            data = self._data
+            if self._header[0] and self._lt(data[0], item):
+                item, data[0] = data[0], item
+                siftup(data, 0, self._header[0], self._lt)
+            return item
+
+    def replace(self, item):
+        with self._lock:
+            if not self._header[0]:
+                raise IndexError('replace on empty heap')
+            data = self._data
+            top, data[0] = data[0], item
+            siftup(data, 0, self._header[0], self._lt)
+            return top
+
+    def to_list(self):
+        with self._lock:
+            return self._data[: self._header[0]].tolist()
+
+    def unlink(self):
+        """
+        Frees the shared memory block once every process has closed it. Must
+        be called by exactly one process.
+        :return:
+        """
+        self._shm.unlink()
+
+    def _open(self, shm, lock):
+        _, capacity, typecode, _ = _HEADER.unpack_from(shm.buf)
+        typecode = typecode.decode()
+        itemsize = array(typecode).itemsize
+        end = _DATA_OFFSET + capacity * itemsize
+        self._lock = multiprocessing.Lock() if lock is None else lock
+        # Some typecodes can't be cast to, nothing must be left exported then.
+        # `_shm` is set last, once there are views to release, see `__del__`.
+        self._data = shm.buf[_DATA_OFFSET:end].cast(typecode)
+        self._header = shm.buf[:16].cast('q')
+        self._shm = shm
+
+    def _pop(self):
+        header, data = self._header, self._data
+        size = header[0]
+        if not size:
+            raise IndexError('pop from empty heap')
+        size -= 1
+        header[0] = size
+        top = data[0]
+        if size:
+            data[0] = data[size]
+            siftup(data, 0, size, self._lt)
+        return top
+
+
+class SharedNumericMinHeap(SharedNumericHeap):
+    pass
+
+
+class SharedNumericMaxHeap(SharedNumericHeap):
+    _lt = staticmethod(operator.gt)
+    _order = b'>'
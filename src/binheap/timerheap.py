@@ -0,0 +1,153 @@
+import heapq
+from itertools import count
+from time import monotonic
+
+# Cancelled entries are only swept out of heaps with more of them than this.
+_MIN_COMPACT_COUNT = 64
+
+
+class TimerHandle:
+    """Handle of an item scheduled on a TimerHeap, returned by `push`."""
+
+    __slots__ = ('deadline', 'item', '_owner', '_cancelled')
+
+    def __init__(self, deadline, item, owner):
+        self.deadline = deadline
+        self.item = item
+        self._owner = owner
+        self._cancelled = False
+
+    def __repr__(self):
+        state = ' cancelled' if self._cancelled else ''
+        return f'<{self.__class__.__name__} {self.deadline!r} {self.item!r}{state}>'
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Removes the item from its heap in O(1). Returns False if it was already
+        popped or cancelled.
+        :return:
+        """
+        owner = self._owner
+        if owner is None:
+            return False
+        self._owner = None
+        self._cancelled = True
+        owner._cancel()
+        return True
+
+
+class TimerHeap:
+    """Heap of items ordered by deadline, with O(1) cancellation.
+
+    Cancelling a handle only marks its entry dead. Dead entries are skipped
+    when they reach the root and the whole heap is swept in O(n) once they
+    make up more than `compact_ratio` of it, so a cancellation costs O(1)
+    amortized however many timers are cancelled. Items with the same deadline
+    are popped in the order they were pushed.
+    """
+
+    def __init__(self, compact_ratio=0.5):
+        """
+        :param compact_ratio: Fraction of cancelled entries above which the
+        heap is compacted
+        """
+        if not 0 < compact_ratio <= 1:
+            raise ValueError('compact_ratio must be in (0, 1]')
+        self._compact_ratio = compact_ratio
+        # `(deadline, tiebreak, handle)` entries, handles are never compared.
+        self._heap = []
+        self._counter = count()
+        self._cancelled = 0
+
+    def __len__(self):
+        return len(self._heap) - self._cancelled
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self)} pending)'
+
+    def clear(self):
+        for _, _, handle in self._heap:
+            handle._owner = None
+        self._heap.clear()
+        self._cancelled = 0
+
+    def compact(self):
+        """
+        Drops the cancelled entries and re-heapifies, in O(n).
+        :return:
+        """
+        heap = self._heap
+        heap[:] = [entry for entry in heap if not entry[2]._cancelled]
+        heapq.heapify(heap)
+        self._cancelled = 0
+
+    def peek(self):
+        """
+        Returns the `(deadline, item)` pair with the earliest deadline without
+        removing it.
+        :return:
+        """
+        self._skip_cancelled()
+        deadline, _, handle = self._heap[0]  # index out of range error
+        return deadline, handle.item
+
+    def pop(self):
+        """
+        Removes and returns the `(deadline, item)` pair with the earliest
+        deadline.
+        :return:
+        """
+        self._skip_cancelled()
+        deadline, _, handle = heapq.heappop(self._heap)  # index out of range error
+        handle._owner = None
+        return deadline, handle.item
+
+    def pop_expired(self, now=None):
+        """
+        Removes and returns the `(deadline, item)` pairs whose deadline is at
+        or before `now`, in deadline order.
+        :param now: Current time, `time.monotonic()` if None
+        :return:
+        """
+        if now is None:
+            now = monotonic()
+        heap, expired = self._heap, []
+        while heap and heap[0][0] <= now:
+            deadline, _, handle = heapq.heappop(heap)
+            if handle._cancelled:
+                self._cancelled -= 1
+            else:
+                handle._owner = None
+                expired.append((deadline, handle.item))
+        return expired
+
+    def push(self, deadline, item):
+        """
+        Schedules `item` at `deadline` and returns its handle.
+        :param deadline: Any value comparable with the other deadlines, e.g. a
+        `time.monotonic()` timestamp
+        :param item:
+        :return:
+        """
+        handle = TimerHandle(deadline, item, self)
+        heapq.heappush(self._heap, (deadline, next(self._counter), handle))
+        return handle
+
+    def _cancel(self):
+        self._cancelled += 1
+        cancelled = self._cancelled
+        if (
+            cancelled > _MIN_COMPACT_COUNT
+            and cancelled > len(self._heap) * self._compact_ratio
+        ):
+            self.compact()
+
+    def _skip_cancelled(self):
+        heap = self._heap
+        while heap and heap[0][2]._cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
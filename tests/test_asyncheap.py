@@ -0,0 +1,96 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from pytest import raises
+
+import binheap
+from binheap import AsyncMaxHeap, AsyncMinHeap
+from .utils import create_random_list
+
+
+class TestAsyncHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_push_and_pop(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+
+        async def main():
+            heap = AsyncMinHeap()
+            for item in items:
+                await heap.push(item)
+            assert heap.qsize() == self.SIZE
+            assert heap.peek() == min(items)
+            return [await heap.pop() for _ in items]
+
+        assert asyncio.run(main()) == sorted(items)
+
+        # dropped items would never be marked as done
+        with raises(TypeError):
+            AsyncMinHeap(capacity=2)
+
+    def test_tuples_and_key(self):
+        items = [(val, {}) for val in create_random_list(self.MAX_VAL, self.SIZE)]
+
+        async def main():
+            heap = AsyncMaxHeap(key=lambda item: item[0])
+            for item in items:
+                heap.push_nowait(item)
+            return await heap.pop_many(self.SIZE)
+
+        assert asyncio.run(main()) == sorted(
+            items, key=lambda item: item[0], reverse=True
+        )
+
+    def test_pop_waits(self):
+        async def main():
+            heap = AsyncMinHeap()
+            popper = asyncio.ensure_future(heap.pop_many(3))
+            await asyncio.sleep(0)
+            assert not popper.done()
+            heap.push_nowait(5)
+            heap.push_nowait(2)
+            return await popper
+
+        # items pushed before the popper resumes are popped together
+        assert asyncio.run(main()) == [2, 5]
+
+    def test_maxsize(self):
+        async def main():
+            heap = AsyncMaxHeap(maxsize=2)
+            await heap.push(1)
+            await heap.push(3)
+            pusher = asyncio.ensure_future(heap.push(2))
+            await asyncio.sleep(0)
+            assert not pusher.done()
+            assert heap.pop_nowait() == 3
+            await pusher
+            assert await heap.pop_many(0) == []
+            return await heap.pop_many(5)
+
+        assert asyncio.run(main()) == [2, 1]
+
+    def test_empty(self):
+        async def main():
+            # queues are bound to the running loop before Python 3.10
+            heap = AsyncMinHeap()
+            with raises(asyncio.QueueEmpty):
+                heap.pop_nowait()
+            with raises(IndexError):
+                heap.peek()
+
+        asyncio.run(main())
+
+    def test_lazy_import(self):
+        # asyncio is only imported once an async heap is used
+        code = (
+            'import sys, binheap\n'
+            'assert "asyncio" not in sys.modules\n'
+            'assert binheap.AsyncMinHeap.__module__ == "binheap.asyncheap"\n'
+            'assert "asyncio" in sys.modules\n'
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(binheap.__path__[0]))
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+        with raises(AttributeError):
+            binheap.AsyncHeapMap
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from pytest import raises
+
+from binheap import ConcurrentHeap, MaxHeap
+from .utils import create_random_list
+
+
+class TestConcurrentHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_pop(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        for shards in (1, 4):
+            heap = ConcurrentHeap(items, shards=shards)
+            assert len(heap) == self.SIZE
+            assert heap.peek() == min(items)
+            assert [heap.pop() for _ in items] == sorted(items)
+
+            with raises(IndexError):
+                heap.pop(block=False)
+            with raises(IndexError):
+                heap.pop(timeout=0.01)
+            with raises(IndexError):
+                heap.peek()
+
+    def test_priority(self):
+        heap = ConcurrentHeap(shards=2, stable=True)
+        heap.push({'id': 1}, priority=1)
+        heap.push({'id': 0}, priority=0)
+        assert heap.pop_many(2) == [{'id': 0}, {'id': 1}]
+
+    def test_push_and_pop_many(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        for shards in (1, 3):
+            heap = ConcurrentHeap(heap_type=MaxHeap, shards=shards)
+            heap.push(items[0])
+            heap.push(items[1:])
+            heap.push_many(iter([-1]))
+            assert heap.pop_many(10) == sorted(items, reverse=True)[:10]
+            assert heap.pop_many(0) == []
+            assert (
+                heap.pop_many(2 * self.SIZE) == sorted(items + [-1], reverse=True)[10:]
+            )
+            assert heap.pop_many(1, block=False) == []
+            assert heap.pop_many(1, timeout=0.01) == []
+
+    def test_key(self):
+        items = [(val, {}) for val in create_random_list(self.MAX_VAL, self.SIZE)]
+        heap = ConcurrentHeap(items, shards=2, key=lambda item: item[0])
+        assert heap.pop_many(self.SIZE) == sorted(items, key=lambda item: item[0])
+
+    def test_blocking_pop(self):
+        heap = ConcurrentHeap()
+        popped = []
+        consumer = threading.Thread(target=lambda: popped.append(heap.pop(timeout=5)))
+        consumer.start()
+        time.sleep(0.05)
+        heap.push(3)
+        consumer.join()
+        assert popped == [3]
+
+    def test_threads(self):
+        heap = ConcurrentHeap(shards=4)
+        popped, lock, done = [], threading.Lock(), threading.Event()
+
+        def produce(start):
+            for item in range(start, start + 1000, 10):
+                heap.push(item)
+            heap.push_many(range(start + 1000, start + 1100))
+
+        def consume():
+            while not done.is_set():
+                items = heap.pop_many(7, timeout=0.05)
+                with lock:
+                    popped.extend(items)
+
+        producers = [
+            threading.Thread(target=produce, args=(i * 10000,)) for i in range(4)
+        ]
+        consumers = [threading.Thread(target=consume) for _ in range(4)]
+        for thread in consumers + producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        deadline = time.monotonic() + 5
+        while len(popped) < 4 * 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        done.set()
+        for thread in consumers:
+            thread.join()
+        expected = [
+            item
+            for i in range(4)
+            for item in list(range(i * 10000, i * 10000 + 1000, 10))
+            + list(range(i * 10000 + 1000, i * 10000 + 1100))
+        ]
+        assert sorted(popped) == sorted(expected)
+        assert len(heap) == 0
@@ -0,0 +1,107 @@
+import heapq
+
+from pytest import raises
+
+from binheap import DaryMaxHeap, DaryMinHeap, MaxHeap, MinHeap
+from .utils import create_random_list
+
+
+def assert_valid(heap, reverse=False):
+    entries = heap.to_list()
+    for pos in range(1, len(entries)):
+        parent, child = entries[(pos - 1) // heap.d], entries[pos]
+        assert (parent >= child) if reverse else (parent <= child)
+
+
+class TestDaryMinHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_init(self):
+        assert DaryMinHeap().to_list() == []
+        with raises(ValueError):
+            DaryMinHeap(d=1)
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        for d in (2, 3, 4, 8):
+            min_heap = DaryMinHeap(items, d=d)
+            assert min_heap.d == d
+            assert isinstance(min_heap, MinHeap)
+            assert_valid(min_heap)
+
+    def test_pop(self):
+        with raises(IndexError):
+            DaryMinHeap().pop()
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = DaryMinHeap(items, d=3)
+        assert [min_heap.pop() for _ in items] == sorted(items)
+
+    def test_iter_sorted(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        for d in (2, 3, 5):
+            min_heap = DaryMinHeap(items, d=d)
+            assert list(min_heap.iter_sorted()) == sorted(items)
+            assert DaryMaxHeap(items, d=d).peek_many(5) == sorted(items)[::-1][:5]
+
+    def test_push(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = DaryMinHeap()
+        for item in items:
+            min_heap.push(item)
+            assert_valid(min_heap)
+        assert min_heap.peek() == min(items)
+
+    def test_push_pop_and_replace(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap, heapq_heap = DaryMinHeap(items), list(items)
+        heapq.heapify(heapq_heap)
+        for new_item in (-1, 50, self.MAX_VAL):
+            assert min_heap.push_pop(new_item) == heapq.heappushpop(
+                heapq_heap, new_item
+            )
+            assert min_heap.replace(new_item) == heapq.heapreplace(heapq_heap, new_item)
+            assert_valid(min_heap)
+
+    def test_key_and_capacity(self):
+        items = [(val, {}) for val in create_random_list(self.MAX_VAL, self.SIZE)]
+        min_heap = DaryMinHeap(items, key=lambda item: item[0], capacity=10)
+        assert [min_heap.pop() for _ in range(10)] == sorted(
+            items, key=lambda item: item[0]
+        )[-10:]
+
+        # same positional arguments as MinHeap
+        def key(item):
+            return item[0]
+
+        min_heap = DaryMinHeap(items, key, 10)
+        assert min_heap.capacity == 10
+        assert min_heap.d == 4
+        assert [min_heap.pop() for _ in range(10)] == sorted(items, key=key)[-10:]
+
+    def test_meld(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = DaryMinHeap(items[:10])
+        min_heap.meld(DaryMinHeap(items[10:], d=8))
+        min_heap.meld(DaryMinHeap([1, 2]))
+        assert_valid(min_heap)
+        assert [min_heap.pop() for _ in range(len(min_heap))] == sorted(items + [1, 2])
+
+
+class TestDaryMaxHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_pop(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = DaryMaxHeap(items[:10], d=5)
+        max_heap.push(items[10:])
+        assert isinstance(max_heap, MaxHeap)
+        assert_valid(max_heap, reverse=True)
+        assert max_heap.push_pop(self.MAX_VAL) == self.MAX_VAL
+        assert [max_heap.pop() for _ in items] == sorted(items, reverse=True)
+
+    def test_key(self):
+        items = [(2, 'a'), (1, 'b'), (2, 'c'), (1, 'd'), (2, 'e')]
+        max_heap = DaryMaxHeap(items, key=lambda item: item[0])
+        assert [max_heap.pop() for _ in items] == sorted(
+            items, key=lambda item: item[0], reverse=True
+        )
@@ -0,0 +1,104 @@
+import copy
+import heapq
+import pickle
+import struct
+
+from pytest import raises
+
+from binheap import FileMaxHeap, FileMinHeap, fileheap
+from .utils import create_heapq_heap, create_random_list
+
+
+class TestFileHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_push_and_pop(self, tmp_path):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        with FileMinHeap(tmp_path / 'heap') as min_heap:
+            assert min_heap.format == '<d'
+            with raises(IndexError):
+                min_heap.pop()
+            with raises(IndexError):
+                min_heap.peek()
+
+            heapq_heap = []
+            for item in items:
+                min_heap.push(item)
+                heapq.heappush(heapq_heap, item)
+            assert min_heap.to_list() == heapq_heap
+            assert min_heap.push_pop(-1) == -1
+            assert min_heap.replace(self.MAX_VAL) == min(items)
+            assert [min_heap.pop() for _ in items] == sorted(items)[1:] + [self.MAX_VAL]
+
+    def test_reopen(self, tmp_path):
+        path = tmp_path / 'heap'
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        with FileMinHeap(path, 'q') as min_heap:
+            min_heap.push(items)
+            layout = min_heap.to_list()
+        assert layout == create_heapq_heap(items)
+
+        with FileMinHeap(path) as min_heap:
+            assert min_heap.format == '<q'
+            assert min_heap.to_list() == layout
+            assert min_heap.pop() == min(items)
+
+        with raises(ValueError):
+            FileMaxHeap(path)
+        with raises(ValueError):
+            FileMinHeap(path, 'd')
+        # formats without a byte order are little-endian
+        with FileMinHeap(path, '<q') as min_heap:
+            assert len(min_heap) == self.SIZE - 1
+
+    def test_portable(self, tmp_path):
+        path = tmp_path / 'heap'
+        with FileMinHeap(path, 'iq') as min_heap:
+            min_heap.push((1, 2))
+            # a record that can't be packed isn't counted
+            with raises(struct.error):
+                min_heap.push((1.5, 2))
+            with raises(struct.error):
+                min_heap.push_many([(3, 4), (1.5, 2)])
+            assert len(min_heap) == 1
+        with open(path, 'rb') as file:
+            file.seek(fileheap._DATA_OFFSET)
+            # no padding between the fields
+            assert file.read(12) == struct.pack('<iq', 1, 2)
+
+        with raises(ValueError):
+            FileMinHeap(tmp_path / 'other', 'd' * 40)
+        assert not (tmp_path / 'other').exists()
+
+    def test_records(self, tmp_path, monkeypatch):
+        # the file grows as needed
+        monkeypatch.setattr(fileheap, '_INITIAL_CAPACITY', 4)
+        records = [(float(item), i) for i, item in enumerate(range(self.SIZE, 0, -1))]
+        with FileMaxHeap(tmp_path / 'heap', 'dQ') as max_heap:
+            for record in records[:10]:
+                max_heap.push(record)
+            max_heap.push(records[10:])
+            assert (49.0, 1) in max_heap
+            assert max_heap[0] == records[0]
+            del max_heap[0]
+            assert max_heap.pop() == records[1]
+            max_heap.clear()
+            assert len(max_heap) == 0
+            max_heap.consume(records)
+            assert max_heap.pop() == records[0]
+
+    def test_pickle(self, tmp_path):
+        # copies would be unsynchronized handles on the same file
+        with FileMaxHeap(tmp_path / 'heap', 'dQ') as max_heap:
+            max_heap.push([(1.0, 1), (3.0, 3)])
+            with raises(TypeError):
+                pickle.dumps(max_heap)
+            with raises(TypeError):
+                copy.copy(max_heap)
+            max_heap.instrument()
+            with raises(TypeError):
+                pickle.dumps(max_heap)
+
+        # the file is shared by re-opening it from its path
+        with FileMaxHeap(max_heap.path) as reopened:
+            assert reopened.pop() == (3.0, 3)
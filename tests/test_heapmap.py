@@ -0,0 +1,89 @@
+from random import randrange
+
+from pytest import raises
+
+from binheap import MaxHeapMap, MinHeapMap, heapmap
+from .utils import create_random_list
+
+
+class TestMinHeapMap:
+    MAX_VAL, SIZE = 100, 50
+
+    def random_pairs(self):
+        return [(randrange(5), randrange(self.MAX_VAL)) for _ in range(self.SIZE)]
+
+    def test_push_and_pop(self):
+        pairs = self.random_pairs()
+        heap_map = MinHeapMap()
+        for key, item in pairs:
+            heap_map.push(key, item)
+        assert len(heap_map) == self.SIZE
+        for key in list(heap_map):
+            items = sorted(item for k, item in pairs if k == key)
+            assert heap_map.peek(key) == items[0]
+            assert [heap_map.pop(key) for _ in items] == items
+            assert key not in heap_map
+        assert len(heap_map) == 0
+
+        with raises(KeyError):
+            heap_map.pop(0)
+        with raises(KeyError):
+            heap_map.peek(0)
+
+    def test_pop_best(self, monkeypatch):
+        # rebuild the index often
+        monkeypatch.setattr(heapmap, '_MIN_STALE_ENTRIES', 0)
+        pairs = self.random_pairs()
+        heap_map = MinHeapMap()
+        for key, item in pairs:
+            heap_map.push(key, item)
+        # popping from a key leaves a stale entry in the index
+        first = pairs[0][0]
+        heap_map.push(first, -1)
+        assert heap_map.peek_best() == (first, -1)
+        assert heap_map.pop(first) == -1
+
+        popped = [heap_map.pop_best() for _ in pairs]
+        assert [item for _, item in popped] == sorted(item for _, item in pairs)
+        assert sorted(popped) == sorted(pairs)
+
+        with raises(IndexError):
+            heap_map.pop_best()
+
+    def test_push_many(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        heap_map = MinHeapMap({'a': items[:10]})
+        heap_map.push_many('a', items[10:])
+        heap_map.push_many('b', [])
+        heap_map.push_many('b', [self.MAX_VAL])
+        assert 'b' in heap_map
+        del heap_map['b']
+        assert len(heap_map) == self.SIZE
+        assert [heap_map.pop_best()[1] for _ in items] == sorted(items)
+
+    def test_clear(self):
+        heap_map = MinHeapMap({'a': [1], 'b': [2]})
+        heap_map.clear()
+        assert len(heap_map) == 0
+        assert list(heap_map) == []
+
+    def test_repr(self):
+        assert repr(MinHeapMap()) == 'MinHeapMap()'
+        assert repr(MinHeapMap({'a': [2, 1]})) == "MinHeapMap({'a': [1, 2]})"
+
+    def test_slots(self):
+        with raises(AttributeError):
+            MinHeapMap().attribute = None
+
+
+class TestMaxHeapMap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_pop_best(self):
+        pairs = [(randrange(5), randrange(self.MAX_VAL)) for _ in range(self.SIZE)]
+        heap_map = MaxHeapMap()
+        for key, item in pairs:
+            heap_map.push(key, item)
+        assert heap_map.peek_best()[1] == max(item for _, item in pairs)
+        popped = [heap_map.pop_best()[1] for _ in pairs]
+        assert popped == sorted((item for _, item in pairs), reverse=True)
@@ -1,7 +1,16 @@
+import os
+import subprocess
+import sys
+from importlib import import_module
+from operator import itemgetter
 from random import randrange
 
+import binheap
 from binheap import heapsort
 
+# The module, shadowed by the function in the package namespace.
+heapsort_module = import_module('binheap.heapsort')
+
 
 class TestHeapSort:
     def test_heapsort_on_list_of_ints(self):
@@ -21,3 +30,71 @@ class TestHeapSort:
 
         # descending sort
         assert heapsort(items, reverse=True) == sorted(items, reverse=True)
+
+    def test_heapsort_with_key(self):
+        items = [(randrange(10), randrange(100)) for _ in range(100)]
+
+        def key(item):
+            return item[0]
+
+        # sort is stable
+        assert heapsort(items, key=key) == sorted(items, key=key)
+        assert heapsort(items, reverse=True, key=key) == sorted(
+            items, key=key, reverse=True
+        )
+
+    def test_heapsort_with_limit(self):
+        items = [randrange(100) for _ in range(100)]
+
+        assert heapsort(items, limit=10) == sorted(items)[:10]
+        assert heapsort(items, reverse=True, limit=10) == sorted(items)[::-1][:10]
+        assert heapsort(items, limit=0) == []
+        assert heapsort(items, limit=-1) == []
+        assert heapsort(items, limit=1000) == sorted(items)
+
+    def test_heapsort_lazy(self):
+        items = [randrange(100) for _ in range(100)]
+
+        sorted_items = heapsort(iter(items), lazy=True)
+        assert not isinstance(sorted_items, list)
+        assert next(sorted_items) == min(items)
+        assert list(sorted_items) == sorted(items)[1:]
+
+        assert (
+            list(heapsort(items, reverse=True, limit=5, lazy=True))
+            == sorted(items, reverse=True)[:5]
+        )
+        assert list(heapsort([], lazy=True)) == []
+
+    def test_lazy_process_pool(self):
+        # concurrent.futures is only imported to sort with `workers`
+        code = (
+            'import sys, binheap\n'
+            'binheap.heapsort(range(10), workers=2)\n'
+            'assert "concurrent.futures" not in sys.modules\n'
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(binheap.__path__[0]))
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+
+    def test_heapsort_parallel(self, monkeypatch):
+        monkeypatch.setattr(heapsort_module, '_PARALLEL_MIN_SIZE', 10)
+        items = [(randrange(10), randrange(100)) for _ in range(100)]
+        key = itemgetter(0)
+
+        assert heapsort(items, workers=3) == sorted(items)
+        # sort is stable across chunks
+        assert heapsort(items, key=key, workers=3) == sorted(items, key=key)
+        assert heapsort(items, reverse=True, key=key, workers=3) == sorted(
+            items, key=key, reverse=True
+        )
+        assert heapsort(items, limit=5, workers=3) == sorted(items)[:5]
+        assert (
+            heapsort(items, key=key, limit=5, workers=3) == sorted(items, key=key)[:5]
+        )
+        assert heapsort(items, limit=-1, workers=3) == []
+        assert list(heapsort(iter(items), lazy=True, workers=3)) == sorted(items)
+
+        # small inputs are sorted serially
+        assert heapsort(items[:5], key=lambda item: item, workers=3) == sorted(
+            items[:5]
+        )
@@ -0,0 +1,232 @@
+import pickle
+from random import randint, shuffle
+
+from pytest import raises
+
+from binheap import IndexedMaxHeap, IndexedMinHeap
+from .utils import create_random_list
+
+
+def assert_valid(heap, reverse=False):
+    """Checks the heap invariant and the item to position map."""
+    entries = heap.to_list()
+    for pos in range(1, len(entries)):
+        parent, child = entries[(pos - 1) // 2][1], entries[pos][1]
+        assert (parent >= child) if reverse else (parent <= child)
+    assert {item: pos for pos, (item, _) in enumerate(entries)} == heap._index
+
+
+def pop_all(heap):
+    return [heap.pop() for _ in range(len(heap))]
+
+
+class TestIndexedMinHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def random_pairs(self):
+        items = list(range(self.SIZE))
+        shuffle(items)
+        return list(zip(items, create_random_list(self.MAX_VAL, self.SIZE)))
+
+    def test_init(self):
+        assert IndexedMinHeap().to_list() == []
+
+        pairs = self.random_pairs()
+        min_heap = IndexedMinHeap(pairs)
+        assert_valid(min_heap)
+        assert sorted(min_heap.to_list()) == sorted(pairs)
+
+        # mapping and repeated items
+        min_heap = IndexedMinHeap({'a': 3, 'b': 1})
+        assert min_heap.to_list() == [('b', 1), ('a', 3)]
+        assert IndexedMinHeap([('a', 3), ('a', 1)]).to_list() == [('a', 1)]
+
+    def test_peek(self):
+        with raises(IndexError):
+            IndexedMinHeap().peek()
+
+        pairs = self.random_pairs()
+        assert IndexedMinHeap(pairs).peek()[1] == min(p for _, p in pairs)
+
+    def test_pop(self):
+        with raises(IndexError):
+            IndexedMinHeap().pop()
+
+        pairs = self.random_pairs()
+        min_heap = IndexedMinHeap(pairs)
+        popped = pop_all(min_heap)
+        assert [p for _, p in popped] == sorted(p for _, p in pairs)
+        assert sorted(popped) == sorted(pairs)
+        assert min_heap._index == {}
+
+    def test_push(self):
+        min_heap = IndexedMinHeap()
+        pairs = self.random_pairs()
+        for item, priority in pairs:
+            min_heap.push(item, priority)
+            assert_valid(min_heap)
+        assert sorted(min_heap.to_list()) == sorted(pairs)
+
+        # pushing an existing item updates its priority
+        item = pairs[0][0]
+        min_heap.push(item, -1)
+        assert len(min_heap) == self.SIZE
+        assert min_heap.peek() == (item, -1)
+
+    def test_update(self):
+        pairs = self.random_pairs()
+        min_heap = IndexedMinHeap(pairs)
+        expected = dict(pairs)
+        for item in range(self.SIZE):
+            priority = randint(-self.MAX_VAL, 2 * self.MAX_VAL)
+            min_heap.update(item, priority)
+            expected[item] = priority
+            assert_valid(min_heap)
+            assert min_heap.priority(item) == priority
+        popped = pop_all(min_heap)
+        assert [p for _, p in popped] == sorted(expected.values())
+        assert dict(popped) == expected
+
+        with raises(KeyError):
+            min_heap.update('missing', 1)
+
+    def test_remove(self):
+        pairs = self.random_pairs()
+        min_heap = IndexedMinHeap(pairs)
+        shuffle(pairs)
+        for item, priority in pairs[: self.SIZE // 2]:
+            assert min_heap.remove(item) == priority
+            assert item not in min_heap
+            assert_valid(min_heap)
+        assert sorted(min_heap.to_list()) == sorted(pairs[self.SIZE // 2 :])
+
+        with raises(KeyError):
+            min_heap.remove(pairs[0][0])
+
+    def test_push_many(self):
+        min_heap = IndexedMinHeap({'a': 5, 'b': 7, 'c': 9})
+        min_heap.push_many({'a': 8})
+        assert_valid(min_heap)
+        min_heap.push_many([('d', 1), ('b', 10), ('e', 0)])
+        assert_valid(min_heap)
+        assert pop_all(min_heap) == [('e', 0), ('d', 1), ('a', 8), ('c', 9), ('b', 10)]
+
+    def test_meld(self):
+        min_heap = IndexedMinHeap({'a': 5, 'b': 7})
+        min_heap.meld(IndexedMinHeap({'b': 1, 'c': 3}))
+        assert_valid(min_heap)
+        assert pop_all(min_heap) == [('b', 1), ('c', 3), ('a', 5)]
+
+        min_heap = IndexedMinHeap({'a': 1})
+        merged = IndexedMinHeap.merge(min_heap)
+        assert min_heap.to_list() == merged.to_list() == [('a', 1)]
+
+    def test_push_pop(self):
+        min_heap = IndexedMinHeap({'a': 5, 'b': 7})
+        assert min_heap.push_pop('c', 1) == ('c', 1)
+        assert min_heap.push_pop('c', 6) == ('a', 5)
+        assert_valid(min_heap)
+        assert min_heap.push_pop('b', 0) == ('b', 0)
+        assert min_heap.to_list() == [('c', 6)]
+
+    def test_replace(self):
+        with raises(IndexError):
+            IndexedMinHeap().replace('a', 1)
+
+        min_heap = IndexedMinHeap({'a': 5, 'b': 7})
+        assert min_heap.replace('c', 9) == ('a', 5)
+        assert min_heap.replace('b', 10) == ('b', 7)
+        assert_valid(min_heap)
+        assert pop_all(min_heap) == [('c', 9), ('b', 10)]
+
+    def test_contains(self):
+        min_heap = IndexedMinHeap({'a': 5, 'b': 7})
+        assert 'a' in min_heap
+        assert ('c' in min_heap) is False
+        assert (5 in min_heap) is False
+
+    def test_delitem(self):
+        pairs = self.random_pairs()
+        min_heap = IndexedMinHeap(pairs)
+        expected = min_heap.to_list()
+        for index in (3, -1):
+            expected.remove(min_heap[index])
+            del min_heap[index]
+            assert_valid(min_heap)
+        assert sorted(min_heap.to_list()) == sorted(expected)
+
+        with raises(IndexError):
+            del min_heap[self.SIZE]
+
+    def test_discard(self):
+        min_heap = IndexedMinHeap({'a': 1, 'b': 2, 'c': 0})
+        assert min_heap.discard('c')
+        assert not min_heap.discard('c')
+        assert_valid(min_heap)
+        assert pop_all(min_heap) == [('a', 1), ('b', 2)]
+
+    def test_iter_sorted(self):
+        pairs = self.random_pairs()
+        min_heap = IndexedMinHeap(pairs)
+        priorities = [p for _, p in min_heap.iter_sorted()]
+        assert priorities == sorted(p for _, p in dict(pairs).items())
+        assert [p for _, p in min_heap.peek_many(3)] == priorities[:3]
+        max_heap = IndexedMaxHeap(pairs)
+        assert max_heap.peek_many(1) == [max_heap.peek()]
+
+    def test_pop_many(self):
+        pairs = self.random_pairs()
+        min_heap = IndexedMinHeap(pairs)
+        priorities = sorted(p for _, p in pairs)
+        assert [p for _, p in min_heap.pop_many(3)] == priorities[:3]
+        assert_valid(min_heap)
+        assert [p for _, p in min_heap.pop_many(20)] == priorities[3:23]
+        assert_valid(min_heap)
+        min_heap.push('new', -1)
+        assert min_heap.pop() == ('new', -1)
+        assert len(min_heap.drain()) == self.SIZE - 23
+        assert min_heap._index == {}
+
+        max_heap = IndexedMaxHeap(pairs)
+        popped = max_heap.drain()
+        assert [p for _, p in popped] == sorted(priorities, reverse=True)
+        assert sorted(popped) == sorted(pairs)
+
+    def test_clear(self):
+        min_heap = IndexedMinHeap(self.random_pairs())
+        min_heap.clear()
+        assert len(min_heap) == 0
+        assert 0 not in min_heap
+
+    def test_repr(self):
+        assert repr(IndexedMinHeap()) == 'IndexedMinHeap()'
+        assert repr(IndexedMinHeap({'a': 1})) == "IndexedMinHeap([('a', 1)])"
+
+    def test_pickle(self):
+        min_heap = IndexedMinHeap(self.random_pairs())
+        restored = pickle.loads(pickle.dumps(min_heap))
+        assert restored == min_heap
+        assert restored._index == min_heap._index
+        restored.update(0, -1)
+        assert restored.peek() == (0, -1)
+
+
+class TestIndexedMaxHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_pop(self):
+        pairs = list(enumerate(create_random_list(self.MAX_VAL, self.SIZE)))
+        max_heap = IndexedMaxHeap(pairs)
+        assert_valid(max_heap, reverse=True)
+        popped = pop_all(max_heap)
+        assert [p for _, p in popped] == sorted((p for _, p in pairs), reverse=True)
+
+    def test_update_and_remove(self):
+        pairs = list(enumerate(create_random_list(self.MAX_VAL, self.SIZE)))
+        max_heap = IndexedMaxHeap(pairs)
+        max_heap.update(0, self.MAX_VAL)
+        assert max_heap.peek() == (0, self.MAX_VAL)
+        max_heap.remove(0)
+        max_heap.update(1, -1)
+        assert_valid(max_heap, reverse=True)
+        assert pop_all(max_heap)[-1] == (1, -1)
@@ -0,0 +1,81 @@
+import pickle
+
+from pytest import raises
+
+from binheap import DaryMinHeap, IndexedMaxHeap, MaxHeap, MinHeap, NumericMinHeap
+from .utils import create_random_list
+
+
+class TestInstrument:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_stats(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = MinHeap(items)
+        with raises(RuntimeError):
+            min_heap.stats()
+
+        min_heap.instrument()
+        assert type(min_heap) is not MinHeap
+        assert isinstance(min_heap, MinHeap)
+        assert repr(min_heap).startswith('MinHeap(')
+        min_heap.push(self.MAX_VAL)
+        min_heap.push([1, 2, 3])
+        popped = [min_heap.pop() for _ in range(10)]
+        assert popped == sorted(items + [self.MAX_VAL, 1, 2, 3])[:10]
+
+        stats = min_heap.stats()
+        assert stats['comparisons'] is None
+        assert stats['size'] == self.SIZE - 6
+        assert stats['peak_size'] == self.SIZE + 4
+        assert stats['memory_bytes'] > 0
+        operations = stats['operations']
+        # push_many called by push isn't recorded separately
+        assert sorted(operations) == ['pop', 'push']
+        assert operations['push']['count'] == 2
+        assert operations['pop']['count'] == 10
+        assert sum(operations['pop']['latency_ns'].values()) == 10
+        assert operations['pop']['total_seconds'] > 0
+
+        # instrumenting again resets the statistics
+        min_heap.instrument()
+        assert min_heap.stats()['operations'] == {}
+
+        min_heap.uninstrument()
+        assert type(min_heap) is MinHeap
+        with raises(RuntimeError):
+            min_heap.stats()
+
+    def test_comparisons(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        for heap_type in (MinHeap, MaxHeap, DaryMinHeap, NumericMinHeap):
+            heap = heap_type(items)
+            heap.instrument(comparisons=True)
+            heap.push(-1)
+            popped = [heap.pop() for _ in range(len(heap))]
+            assert popped == sorted(items + [-1], reverse=heap_type is MaxHeap)
+            assert heap.stats()['comparisons'] > self.SIZE
+
+        for heap_type in (MinHeap, MaxHeap, NumericMinHeap):
+            heap = heap_type(items)
+            heap.instrument(comparisons=True)
+            assert heap.drain() == sorted(items, reverse=heap_type is MaxHeap)
+            assert heap.stats()['comparisons'] > self.SIZE
+
+        heap = IndexedMaxHeap(enumerate(items))
+        heap.instrument(comparisons=True)
+        assert len(heap.pop_many(self.SIZE // 2)) == self.SIZE // 2
+        assert heap.stats()['comparisons'] > self.SIZE // 2
+        heap = IndexedMaxHeap(enumerate(items))
+        heap.instrument(comparisons=True)
+        heap.update(0, self.MAX_VAL)
+        assert heap.pop() == (0, self.MAX_VAL)
+        assert heap.stats()['comparisons'] > 0
+        assert sorted(heap.stats()['operations']) == ['pop', 'update']
+
+    def test_pickle(self):
+        min_heap = MinHeap(create_random_list(self.MAX_VAL, self.SIZE))
+        min_heap.instrument(comparisons=True)
+        restored = pickle.loads(pickle.dumps(min_heap))
+        assert type(restored) is MinHeap
+        assert restored.to_list() == min_heap.to_list()
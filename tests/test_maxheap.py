@@ -1,4 +1,6 @@
 import heapq
+import pickle
+from operator import itemgetter
 from random import randint
 
 from pytest import raises
@@ -33,8 +35,37 @@ class TestMaxHeap:
         assert max_heap.to_list() == un_negate(heapq_heap)
 
     def test_heapify(self):
-        # todo: when support to key parameter is added.
-        pass
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = MaxHeap(items)
+        max_heap.heapify()
+        assert max_heap.to_list() == un_negate(create_heapq_heap(negate(items)))
+
+        # with key, items are ordered by their key
+        items = [(val, {}) for val in items]
+        max_heap = MaxHeap(items, key=lambda item: item[0])
+        max_heap.heapify()
+        assert [max_heap.pop() for _ in items] == sorted(
+            items, key=lambda item: item[0], reverse=True
+        )
+
+    def test_key(self):
+        items = [(7, {}), (1, {}), (5, {}), (4, {}), (6, {})]
+        max_heap = MaxHeap(items[:2], key=lambda item: item[0])
+        max_heap.push(items[2:])
+        assert max_heap.peek() == (7, {})
+        assert (5, {}) in max_heap
+        assert (3, {}) not in max_heap
+        assert sorted(max_heap) == sorted(items)
+        assert max_heap.push_pop((8, {})) == (8, {})
+        assert max_heap.replace((0, {})) == (7, {})
+        assert max_heap.to_list()[0] == (6, {})
+
+        # equal keys are popped in insertion order
+        items = [(2, 'a'), (1, 'b'), (2, 'c'), (1, 'd'), (2, 'e')]
+        max_heap = MaxHeap(items, key=lambda item: item[0])
+        assert [max_heap.pop() for _ in items] == sorted(
+            items, key=lambda item: item[0], reverse=True
+        )
 
     def test_peek(self):
         # peek on empty heap
@@ -46,6 +77,14 @@ class TestMaxHeap:
         max_heap, heapq_heap = MaxHeap(items), create_heapq_heap(negate(items))
         assert max_heap.peek() == un_negate(heapq_heap[0])
 
+    def test_iter_sorted(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = MaxHeap(items)
+        layout = max_heap.to_list()
+        assert list(max_heap.iter_sorted()) == sorted(items, reverse=True)
+        assert max_heap.peek_many(10) == sorted(items, reverse=True)[:10]
+        assert max_heap.to_list() == layout
+
     def test_pop(self):
         # pop on empty heap
         with raises(IndexError):
@@ -56,6 +95,20 @@ class TestMaxHeap:
         max_heap, heapq_heap = MaxHeap(items), create_heapq_heap(negate(items))
         assert max_heap.pop() == un_negate(heapq.heappop(heapq_heap))
 
+    def test_pop_many(self):
+        items = create_random_list(self.MAX_VAL, 100)
+        max_heap = MaxHeap(items)
+        assert max_heap.pop_many(3) == sorted(items, reverse=True)[:3]
+        assert max_heap.pop_many(50) == sorted(items, reverse=True)[3:53]
+        max_heap.push(self.MAX_VAL)
+        assert max_heap.pop() == self.MAX_VAL
+        assert max_heap.drain() == sorted(items, reverse=True)[53:]
+
+        # equal keys are popped in insertion order
+        items = [(val, {}) for val in create_random_list(self.MAX_VAL, 100)]
+        max_heap = MaxHeap(items, key=itemgetter(0))
+        assert max_heap.drain() == sorted(items, key=itemgetter(0), reverse=True)
+
     def test_push(self):
         # single item
         item = 1
@@ -64,11 +117,15 @@ class TestMaxHeap:
         heapq.heappush(heapq_heap, item)
         assert max_heap.to_list() == heapq_heap
 
-        # many items
+        # many items, a batch at least as large as the heap is heapified
         items = [7, 1, 5, 4, 6, 3]
-        max_heap, heapq_heap = MaxHeap(), list()
+        max_heap, heapq_heap = MaxHeap(), create_heapq_heap(negate(items))
         max_heap.push(items)
-        for item in items:
+        assert max_heap.to_list() == un_negate(heapq_heap)
+
+        # many items, a smaller batch is pushed one by one
+        max_heap.push([2, 8])
+        for item in [2, 8]:
             heapq.heappush(heapq_heap, -item)
         assert max_heap.to_list() == un_negate(heapq_heap)
 
@@ -80,6 +137,47 @@ class TestMaxHeap:
             heapq.heappush(heapq_heap, tuple(-val for val in item))
         assert max_heap.pop() == un_negate(heapq.heappop(heapq_heap))
 
+    def test_only_lt(self):
+        class OnlyLt:
+            def __init__(self, val):
+                self.val = val
+
+            def __lt__(self, other):
+                return self.val < other.val
+
+        items = [OnlyLt(val) for val in create_random_list(self.MAX_VAL, self.SIZE)]
+        max_heap = MaxHeap(items[:5])
+        max_heap.push(items[5:])
+        assert max_heap.push_pop(OnlyLt(-1)).val == max(item.val for item in items)
+        popped = [max_heap.pop().val for _ in range(len(max_heap))]
+        assert popped == sorted((item.val for item in items), reverse=True)[1:] + [-1]
+
+    def test_capacity(self):
+        items = create_random_list(self.MAX_VAL, 5 * self.SIZE)
+        max_heap = MaxHeap(items, capacity=self.SIZE)
+        assert sorted(max_heap) == heapq.nsmallest(self.SIZE, items)
+
+        # push and consume keep the smallest items
+        max_heap = MaxHeap(capacity=3)
+        for item in (5, 1, 7, 3, 9, 0):
+            max_heap.push(item)
+        assert sorted(max_heap) == [0, 1, 3]
+        max_heap.consume(iter([2, -1, 4]))
+        assert sorted(max_heap) == [-1, 0, 1]
+
+    def test_meld_and_merge(self):
+        items, others = (create_random_list(self.MAX_VAL, size) for size in (10, 40))
+        max_heap = MaxHeap(items)
+        max_heap.meld(MaxHeap(others))
+        assert [max_heap.pop() for _ in range(50)] == sorted(
+            items + others, reverse=True
+        )
+
+        merged = MaxHeap.merge(MaxHeap(items), MinHeap(others), MaxHeap(items))
+        assert [merged.pop() for _ in range(60)] == sorted(
+            items + others + items, reverse=True
+        )
+
     def test_push_pop(self):
         items = create_random_list(self.MAX_VAL, self.SIZE)
         max_heap, heapq_heap = MaxHeap(items), create_heapq_heap(negate(items))
@@ -189,6 +287,18 @@ class TestMaxHeap:
         # doesn't contain
         assert (-1 in max_heap) is False
 
+    def test_discard(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = MaxHeap(items)
+        top = max(items)
+        assert max_heap.discard(top)
+        assert max_heap.peek() == sorted(items)[-2]
+        for item in items[1:]:
+            max_heap.discard(item)
+        assert max_heap.to_list() == ([] if items[0] == top else [items[0]])
+        max_heap.push(items)
+        assert max_heap.pop() == top
+
     def test_delitem(self):
         items = create_random_list(self.MAX_VAL, self.SIZE)
         max_heap, heapq_heap = MaxHeap(items), create_heapq_heap(negate(items))
@@ -223,6 +333,13 @@ class TestMaxHeap:
         end = randint(start, self.SIZE)
         assert max_heap[start:end] == max_heap.to_list()[start:end]
 
+    def test_priority(self):
+        max_heap = MaxHeap(stable=True)
+        payloads = [{'id': i} for i in range(6)]
+        for payload in payloads:
+            max_heap.push(payload, priority=payload['id'] % 2)
+        assert [max_heap.pop() for _ in payloads] == payloads[1::2] + payloads[::2]
+
     def test_len(self):
         assert len(MaxHeap()) == 0
 
@@ -241,3 +358,34 @@ class TestMaxHeap:
 
         max_heap = MaxHeap(create_random_list(self.MAX_VAL, self.SIZE))
         assert repr(max_heap) == f'MaxHeap({max_heap.to_list()})'
+
+    def test_pickle(self, monkeypatch):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = MaxHeap(items, capacity=self.SIZE)
+        # the stored values are restored as they are, without re-heapifying
+        monkeypatch.setattr(MaxHeap, '_heapify', None)
+        restored = pickle.loads(pickle.dumps(max_heap))
+        assert restored == max_heap
+        assert restored.capacity == self.SIZE
+        monkeypatch.undo()
+
+        # with a picklable key, the entries are restored with their keys
+        items = [(val, str(val)) for val in items]
+        max_heap = MaxHeap(items, key=itemgetter(0))
+        restored = pickle.loads(pickle.dumps(max_heap))
+        assert restored._heap == max_heap._heap
+        assert [restored.pop() for _ in items] == [max_heap.pop() for _ in items]
+
+    def test_pickle_baseline(self):
+        # pickled by a version wrapping the elements in `Inverted`
+        data = (
+            b'\x80\x02cbinheap.maxheap\nMaxHeap\nq\x00)\x81q\x01}q\x02X\x05\x00\x00'
+            b'\x00_heapq\x03]q\x04(cbinheap.maxheap\nInverted\nq\x05)\x81q\x06N}q\x07X'
+            b'\x04\x00\x00\x00_valq\x08K\x03s\x86q\tbh\x05)\x81q\nN}q\x0bh\x08K\x01s'
+            b'\x86q\x0cbh\x05)\x81q\rN}q\x0eh\x08K\x02s\x86q\x0fbesb.'
+        )
+        max_heap = pickle.loads(data)
+        assert max_heap.to_list() == [3, 1, 2]
+        assert max_heap.capacity is None
+        max_heap.push(4)
+        assert max_heap.drain() == [4, 3, 2, 1]
@@ -0,0 +1,26 @@
+import heapq
+from random import randrange
+
+from binheap import merge
+
+
+class TestMerge:
+    def test_merge(self):
+        lists = [sorted(randrange(100) for _ in range(size)) for size in (0, 5, 40)]
+        assert list(merge(*lists)) == sorted(sum(lists, []))
+        assert list(merge(*(iter(items) for items in lists))) == list(
+            heapq.merge(*lists)
+        )
+        assert list(merge()) == []
+
+    def test_merge_reverse_with_key(self):
+        def key(item):
+            return item[0]
+
+        # dicts aren't comparable, only keys are compared
+        lists = [
+            sorted(((randrange(10), {}) for _ in range(size)), key=key, reverse=True)
+            for size in (3, 20)
+        ]
+        merged = list(merge(*lists, key=key, reverse=True))
+        assert merged == sorted(sum(lists, []), key=key, reverse=True)
@@ -1,8 +1,14 @@
 import heapq
+import os
+import pickle
+import subprocess
+import sys
+from operator import itemgetter
 from random import randint
 
 from pytest import raises
 
+import binheap
 from binheap import MinHeap, MaxHeap
 from .utils import create_heapq_heap, create_random_list
 
@@ -36,8 +42,105 @@ class TestMinHeap:
         assert min_heap.to_list() == heapq_heap
 
     def test_heapify(self):
-        # todo: when support to key parameter is added.
-        pass
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = MinHeap(items)
+        min_heap.heapify()
+        assert min_heap.to_list() == create_heapq_heap(items)
+
+        # with key, objects are ordered by their key and never compared
+        objects = [DummyObject(val) for val in items]
+        min_heap = MinHeap(objects, key=lambda obj: obj.val)
+        min_heap.heapify()
+        assert [min_heap.pop().val for _ in items] == sorted(items)
+
+    def test_key(self):
+        calls = []
+
+        def key(obj):
+            calls.append(obj)
+            return obj.val
+
+        objects = [DummyObject(val) for val in (7, 1, 5, 4, 6, 3)]
+        min_heap = MinHeap(objects[:3], key=key)
+        min_heap.push(objects[3:])
+        assert min_heap.peek() is objects[1]
+        assert objects[2] in min_heap
+        assert DummyObject(5) not in min_heap
+        assert set(min_heap) == set(objects)
+        assert min_heap[0] is objects[1]
+        assert min_heap[:1] == [objects[1]]
+
+        # key is called exactly once per item
+        assert len(calls) == len(objects)
+
+        assert min_heap.push_pop(DummyObject(0)).val == 0
+        assert min_heap.replace(DummyObject(8)) is objects[1]
+        assert [min_heap.pop().val for _ in range(len(min_heap))] == [3, 4, 5, 6, 7, 8]
+
+        # equal keys are popped in insertion order
+        objects = [DummyObject(val) for val in (2, 1, 2, 1, 2)]
+        min_heap = MinHeap(objects, key=lambda obj: obj.val)
+        popped = [min_heap.pop() for _ in objects]
+        assert popped == sorted(objects, key=lambda obj: obj.val)
+
+    def test_priority(self):
+        min_heap = MinHeap(stable=True)
+        # dicts can't be compared, equal priorities are popped in push order
+        payloads = [{'id': i} for i in range(6)]
+        for payload in payloads:
+            min_heap.push(payload, priority=payload['id'] % 2)
+        assert min_heap.peek() == payloads[0]
+        assert [min_heap.pop() for _ in payloads] == payloads[::2] + payloads[1::2]
+
+        # items pushed without a priority are their own priority
+        min_heap.push([3, 1, 2, 1])
+        min_heap.push('a', priority=1)
+        assert [min_heap.pop() for _ in range(5)] == [1, 1, 'a', 2, 3]
+
+        # with a key, the priority replaces it
+        min_heap = MinHeap([3, 1], key=lambda item: -item)
+        min_heap.push(2, priority=-5)
+        assert min_heap.pop() == 2
+
+        with raises(TypeError):
+            MinHeap().push('a', priority=1)
+
+    def test_pickle_in_new_process(self, tmp_path):
+        min_heap = MinHeap(stable=True)
+        for i in range(3):
+            min_heap.push({'id': i}, priority=0)
+        path = tmp_path / 'heap.pickle'
+        path.write_bytes(pickle.dumps(min_heap))
+
+        # the insertion counter starts over in a new process, new entries
+        # must still come after the restored ones without comparing payloads
+        code = (
+            'import pickle, sys\n'
+            'heap = pickle.loads(open(sys.argv[1], "rb").read())\n'
+            'heap.push({"id": "new"}, priority=0)\n'
+            'print([item["id"] for item in heap.drain()])\n'
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(binheap.__path__[0]))
+        output = subprocess.run(
+            [sys.executable, '-c', code, str(path)],
+            env=env,
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        assert output.strip() == "[0, 1, 2, 'new']"
+
+    def test_pickle_baseline(self):
+        # pickled by a version storing nothing but `_heap`
+        data = (
+            b'\x80\x02cbinheap.minheap\nMinHeap\nq\x00)\x81q\x01}q\x02X\x05\x00\x00'
+            b'\x00_heapq\x03]q\x04(K\x01K\x03K\x02esb.'
+        )
+        min_heap = pickle.loads(data)
+        assert min_heap.to_list() == [1, 3, 2]
+        assert min_heap.capacity is None
+        min_heap.push(0)
+        assert min_heap.drain() == [0, 1, 2, 3]
 
     def test_peek(self):
         # peek on empty heap
@@ -49,6 +152,30 @@ class TestMinHeap:
         min_heap, heapq_heap = MinHeap(items), create_heapq_heap(items)
         assert min_heap.pop() == heapq_heap[0]
 
+    def test_iter_sorted(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = MinHeap(items)
+        layout = min_heap.to_list()
+        assert list(min_heap.iter_sorted()) == sorted(items)
+        assert min_heap.peek_many(10) == sorted(items)[:10]
+        assert min_heap.peek_many(self.SIZE + 1) == sorted(items)
+        assert min_heap.peek_many(0) == []
+        assert MinHeap().peek_many(3) == []
+        # the heap is left untouched
+        assert min_heap.to_list() == layout
+
+        # with a key
+        items = [(val, {}) for val in items]
+        min_heap = MinHeap(items, key=lambda item: item[0])
+        expected = sorted(items, key=lambda item: item[0])
+        assert min_heap.peek_many(5) == expected[:5]
+
+        # discarded items are skipped
+        min_heap = MinHeap(range(10))
+        min_heap.discard(3)
+        min_heap.discard(7)
+        assert list(min_heap.iter_sorted()) == [0, 1, 2, 4, 5, 6, 8, 9]
+
     def test_pop(self):
         # pop on empty heap
         with raises(IndexError):
@@ -59,6 +186,34 @@ class TestMinHeap:
         min_heap, heapq_heap = MinHeap(items), create_heapq_heap(items)
         assert min_heap.pop() == heapq.heappop(heapq_heap)
 
+    def test_pop_many(self):
+        items = create_random_list(self.MAX_VAL, 100)
+        min_heap = MinHeap(items)
+        assert min_heap.pop_many(0) == []
+        assert min_heap.pop_many(-1) == []
+        # popped one by one, then sorted
+        assert min_heap.pop_many(3) == sorted(items)[:3]
+        assert min_heap.pop_many(50) == sorted(items)[3:53]
+        min_heap.push(-1)
+        assert min_heap.pop() == -1
+        assert min_heap.drain() == sorted(items)[53:]
+        assert len(min_heap) == 0
+
+        # equal keys are popped in insertion order
+        items = [(val, {}) for val in create_random_list(self.MAX_VAL, 100)]
+        min_heap = MinHeap(items, key=itemgetter(0))
+        assert min_heap.drain() == sorted(items, key=itemgetter(0))
+
+        # removed items are skipped
+        items = create_random_list(self.MAX_VAL, 100)
+        min_heap = MinHeap(items)
+        for item in items[:10]:
+            min_heap.discard(item)
+        assert min_heap.pop_many(40) == sorted(items[10:])[:40]
+        assert min_heap.drain() == sorted(items[10:])[40:]
+        assert items[20] not in min_heap
+        assert not min_heap.discard(items[20])
+
     def test_push(self):
         # single item
         item = 1
@@ -67,11 +222,15 @@ class TestMinHeap:
         heapq.heappush(heapq_heap, item)
         assert min_heap.to_list() == heapq_heap
 
-        # many items
+        # many items, a batch at least as large as the heap is heapified
         items = [7, 1, 5, 4, 6, 3]
-        min_heap, heapq_heap = MinHeap(), list()
+        min_heap, heapq_heap = MinHeap(), create_heapq_heap(items)
         min_heap.push(items)
-        for item in items:
+        assert min_heap.to_list() == heapq_heap
+
+        # many items, a smaller batch is pushed one by one
+        min_heap.push([8, 0])
+        for item in [8, 0]:
             heapq.heappush(heapq_heap, item)
         assert min_heap.to_list() == heapq_heap
 
@@ -83,6 +242,86 @@ class TestMinHeap:
             heapq.heappush(heapq_heap, item)
         assert min_heap.pop() == heapq.heappop(heapq_heap)
 
+    def test_push_many(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = MinHeap(items)
+        for batch in ([], [5], items, (item for item in range(3 * self.SIZE))):
+            min_heap.push_many(batch)
+        expected = sorted(items + [5] + items + list(range(3 * self.SIZE)))
+        assert [min_heap.pop() for _ in range(len(min_heap))] == expected
+
+    def test_capacity(self):
+        with raises(ValueError):
+            MinHeap(capacity=-1)
+
+        items = create_random_list(self.MAX_VAL, 5 * self.SIZE)
+        min_heap = MinHeap(items, capacity=self.SIZE)
+        assert min_heap.capacity == self.SIZE
+        assert sorted(min_heap) == heapq.nlargest(self.SIZE, items)[::-1]
+
+        # push keeps the largest items
+        min_heap = MinHeap(capacity=3)
+        for item in (5, 1, 7, 3, 9, 0):
+            min_heap.push(item)
+        assert sorted(min_heap) == [5, 7, 9]
+        min_heap.push([6, 8])
+        assert sorted(min_heap) == [7, 8, 9]
+
+        assert len(MinHeap([1, 2], capacity=0)) == 0
+
+    def test_consume(self):
+        items = create_random_list(self.MAX_VAL, 5 * self.SIZE)
+        min_heap = MinHeap(items[:2], capacity=self.SIZE)
+        min_heap.consume(iter(items[2:]))
+        assert sorted(min_heap) == heapq.nlargest(self.SIZE, items)[::-1]
+
+        # with key
+        objects = [DummyObject(val) for val in items]
+        min_heap = MinHeap(capacity=self.SIZE, key=lambda obj: obj.val)
+        min_heap.consume(objects)
+        assert sorted(obj.val for obj in min_heap) == sorted(items)[-self.SIZE :]
+
+        # without capacity, all the items are pushed
+        min_heap = MinHeap()
+        min_heap.consume(iter(items))
+        assert min_heap.to_list() == create_heapq_heap(items)
+
+    def test_meld(self):
+        items, others = (create_random_list(self.MAX_VAL, size) for size in (10, 40))
+        min_heap, other = MinHeap(items), MinHeap(others)
+        min_heap.meld(other)
+        assert len(other) == 0
+        assert [min_heap.pop() for _ in range(50)] == sorted(items + others)
+
+        # smaller heap melded into a larger one
+        min_heap, other = MinHeap(others), MinHeap(items)
+        min_heap.meld(other)
+        assert [min_heap.pop() for _ in range(50)] == sorted(items + others)
+
+        # different types, keys and capacities
+        objects = [DummyObject(val) for val in items]
+        min_heap = MinHeap(objects, key=lambda obj: obj.val)
+        min_heap.meld(MinHeap(objects, key=lambda obj: obj.val))
+        assert [min_heap.pop().val for _ in range(20)] == sorted(items + items)
+        min_heap = MinHeap(items)
+        min_heap.meld(MaxHeap(others))
+        assert [min_heap.pop() for _ in range(50)] == sorted(items + others)
+        min_heap = MinHeap(items, capacity=10)
+        min_heap.meld(MinHeap(others))
+        assert sorted(min_heap) == sorted(items + others)[-10:]
+
+    def test_merge(self):
+        lists = [create_random_list(self.MAX_VAL, size) for size in (0, 5, 40, 10)]
+        heaps = [MinHeap(items) for items in lists]
+        merged = MinHeap.merge(*heaps, MaxHeap([1, 2]))
+        assert [len(heap) for heap in heaps] == [len(items) for items in lists]
+        expected = sorted(sum(lists, [1, 2]))
+        assert [merged.pop() for _ in expected] == expected
+
+        merged = MinHeap.merge(*heaps, capacity=5)
+        assert sorted(merged) == sorted(sum(lists, []))[-5:]
+        assert MinHeap.merge() == MinHeap()
+
     def test_push_pop(self):
         items = create_random_list(self.MAX_VAL, self.SIZE)
         min_heap, heapq_heap = MinHeap(items), create_heapq_heap(items)
@@ -175,6 +414,41 @@ class TestMinHeap:
 
         assert (-1 in min_heap) is False
 
+    def test_discard(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = MinHeap(items)
+        removed = items[::3]
+        for item in removed:
+            assert min_heap.discard(item)
+        assert not min_heap.discard(-1)
+        remaining = sorted(items)
+        for item in removed:
+            remaining.remove(item)
+        assert len(min_heap) == len(remaining)
+        assert min_heap.peek() == remaining[0]
+        assert all(item in min_heap for item in remaining)
+        assert sorted(min_heap) == remaining
+
+        # removed items are skipped on pop and can be pushed again
+        min_heap.push(removed[0])
+        remaining = sorted(remaining + [removed[0]])
+        assert [min_heap.pop() for _ in remaining] == remaining
+        assert not min_heap.discard(removed[0])
+
+        # a single removed item isn't compacted until it reaches the root
+        min_heap = MinHeap([1, 2, 3, 4])
+        min_heap.discard(4)
+        assert len(min_heap._heap) == 4
+        assert min_heap.to_list() == [1, 2, 3]
+
+        # with a key and a capacity
+        min_heap = MinHeap(range(10), key=lambda item: -item, capacity=5)
+        assert min_heap.discard(0)
+        min_heap.push(7)
+        assert sorted(min_heap) == [1, 2, 3, 4, 7]
+        min_heap.push(0)
+        assert sorted(min_heap) == [0, 1, 2, 3, 4]
+
     def test_delitem(self):
         items = create_random_list(self.MAX_VAL, self.SIZE)
         min_heap, heapq_heap = MinHeap(items), create_heapq_heap(items)
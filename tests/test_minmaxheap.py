@@ -0,0 +1,111 @@
+import pickle
+from itertools import count
+from operator import itemgetter
+
+from pytest import raises
+
+from binheap import MinMaxHeap
+from .utils import create_random_list
+
+
+def assert_valid(heap):
+    entries = heap._heap
+    for pos in range(1, len(entries)):
+        ancestor, level = pos, (pos + 1).bit_length() - 1
+        while ancestor:
+            ancestor, level = (ancestor - 1) // 2, level - 1
+            if level % 2:
+                assert entries[ancestor] >= entries[pos]
+            else:
+                assert entries[ancestor] <= entries[pos]
+
+
+class TestMinMaxHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_init(self):
+        assert MinMaxHeap().to_list() == []
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        heap = MinMaxHeap(items)
+        assert_valid(heap)
+        assert sorted(heap) == sorted(items)
+        assert heap.peek_min() == min(items)
+        assert heap.peek_max() == max(items)
+
+        with raises(ValueError):
+            MinMaxHeap(capacity=-1)
+        with raises(ValueError):
+            MinMaxHeap(evict='both')
+
+    def test_pop(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        heap = MinMaxHeap(items)
+        expected = sorted(items)
+        while expected:
+            assert heap.pop_min() == expected.pop(0)
+            assert_valid(heap)
+            if expected:
+                assert heap.pop_max() == expected.pop()
+                assert_valid(heap)
+        for method in (heap.pop_min, heap.pop_max, heap.peek_min, heap.peek_max):
+            with raises(IndexError):
+                method()
+
+    def test_push(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        heap = MinMaxHeap()
+        for item in items:
+            heap.push(item)
+            assert_valid(heap)
+        heap.push(items[:10])
+        assert_valid(heap)
+        assert len(heap) == self.SIZE + 10
+        expected = sorted(items + items[:10], reverse=True)[:3]
+        assert [heap.pop_max() for _ in range(3)] == expected
+
+    def test_key(self):
+        items = [(val, {}) for val in create_random_list(self.MAX_VAL, self.SIZE)]
+        heap = MinMaxHeap(items, key=lambda item: item[0])
+        heap.push([(-1, {}), (self.MAX_VAL, {})])
+        assert heap.pop_min() == (-1, {})
+        assert heap.pop_max() == (self.MAX_VAL, {})
+        assert (items[0][0], {}) in heap
+
+    def test_pickle(self, monkeypatch):
+        items = [(0, {'id': i}) for i in range(5)]
+        data = pickle.dumps(MinMaxHeap(items, key=itemgetter(0)))
+        # unpickled in a process where the insertion counter starts over
+        monkeypatch.setattr(MinMaxHeap, '_counter', count())
+        restored = pickle.loads(data)
+        restored.push([(0, {'id': 'new'})])
+        assert restored.pop_max() == (0, {'id': 'new'})
+        assert [restored.pop_min()[1]['id'] for _ in range(5)] == [0, 1, 2, 3, 4]
+
+    def test_capacity(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        heap = MinMaxHeap(items, capacity=10)
+        assert heap.capacity == 10
+        assert sorted(heap) == sorted(items)[:10]
+        heap.push(self.MAX_VAL)
+        heap.push(-1)
+        assert sorted(heap) == sorted(items + [-1])[:10]
+
+        heap = MinMaxHeap(capacity=10, evict='min')
+        for item in items:
+            heap.push(item)
+        assert sorted(heap) == sorted(items)[-10:]
+        assert_valid(heap)
+
+        heap = MinMaxHeap(items, capacity=0)
+        heap.push(1)
+        assert len(heap) == 0
+
+    def test_clear(self):
+        heap = MinMaxHeap(create_random_list(self.MAX_VAL, self.SIZE))
+        heap.clear()
+        assert len(heap) == 0
+
+    def test_repr(self):
+        assert repr(MinMaxHeap()) == 'MinMaxHeap()'
+        assert repr(MinMaxHeap([2, 1])) == 'MinMaxHeap([1, 2])'
+        assert str(MinMaxHeap([1])) == '[1]'
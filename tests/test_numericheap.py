@@ -0,0 +1,163 @@
+import heapq
+import os
+import pickle
+import subprocess
+import sys
+
+from pytest import importorskip, mark, raises
+
+import binheap
+from binheap import NumericMaxHeap, NumericMinHeap, numericheap
+from .utils import create_heapq_heap, create_random_list
+
+
+class TestNumericMinHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_init(self):
+        assert NumericMinHeap().to_list() == []
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = NumericMinHeap(items)
+        assert min_heap.to_list() == create_heapq_heap(items)
+        assert min_heap.typecode == 'd'
+
+        # typed storage
+        assert NumericMinHeap(items, typecode='q').to_list() == create_heapq_heap(items)
+        with raises(OverflowError):
+            NumericMinHeap([-1], typecode='B')
+        with raises(TypeError):
+            NumericMinHeap(['a'])
+
+    def test_pop(self):
+        with raises(IndexError):
+            NumericMinHeap().pop()
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = NumericMinHeap(items)
+        assert [min_heap.pop() for _ in items] == sorted(items)
+
+    def test_push(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap, heapq_heap = NumericMinHeap(), []
+        for item in items:
+            min_heap.push(item)
+            heapq.heappush(heapq_heap, item)
+        assert min_heap.to_list() == heapq_heap
+
+        min_heap.push(items)
+        assert min_heap.peek() == min(items)
+        assert len(min_heap) == 2 * self.SIZE
+
+    def test_push_pop_and_replace(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap, heapq_heap = NumericMinHeap(items), create_heapq_heap(items)
+        for new_item in (-1, 50, self.MAX_VAL):
+            assert min_heap.push_pop(new_item) == heapq.heappushpop(
+                heapq_heap, new_item
+            )
+            assert min_heap.replace(new_item) == heapq.heapreplace(heapq_heap, new_item)
+        assert min_heap.to_list() == heapq_heap
+
+    def test_pop_many(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = NumericMinHeap(items)
+        assert min_heap.pop_many(0) == []
+        assert min_heap.pop_many(10) == sorted(items)[:10]
+        assert min_heap.pop_many(2 * self.SIZE) == sorted(items)[10:]
+        assert len(min_heap) == 0
+
+    def test_numpy(self, monkeypatch):
+        importorskip('numpy')
+        monkeypatch.setattr(numericheap, '_NUMPY_MIN_SIZE', 0)
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = NumericMinHeap(items)
+        assert min_heap.pop_many(self.SIZE // 2) == sorted(items)[: self.SIZE // 2]
+        min_heap.push(-1)
+        assert [min_heap.pop() for _ in range(len(min_heap))] == [-1] + sorted(items)[
+            self.SIZE // 2 :
+        ]
+
+    def test_lazy_numpy(self):
+        # numpy is only imported once a heap is large enough to use it
+        code = (
+            'import sys, binheap\n'
+            'binheap.NumericMinHeap(range(10)).drain()\n'
+            'assert "numpy" not in sys.modules\n'
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(binheap.__path__[0]))
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+
+    def test_meld(self):
+        items, others = (create_random_list(self.MAX_VAL, size) for size in (10, 40))
+        min_heap = NumericMinHeap(items)
+        min_heap.meld(NumericMinHeap(others))
+        min_heap.meld(NumericMinHeap([1], typecode='i'))
+        assert min_heap.typecode == 'd'
+        assert min_heap.pop_many(51) == sorted(items + others + [1])
+
+    def test_clear(self):
+        min_heap = NumericMinHeap(create_random_list(self.MAX_VAL, self.SIZE))
+        min_heap.clear()
+        assert len(min_heap) == 0
+
+    def test_getitem(self):
+        min_heap = NumericMinHeap([3, 1, 2])
+        assert min_heap[0] == 1
+        assert min_heap[1:] == min_heap.to_list()[1:]
+
+    def test_repr(self):
+        assert repr(NumericMinHeap()) == 'NumericMinHeap()'
+        assert repr(NumericMinHeap([2, 1])) == 'NumericMinHeap([1.0, 2.0])'
+
+    def test_iter_sorted(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        assert NumericMinHeap(items).peek_many(5) == sorted(items)[:5]
+        assert NumericMaxHeap(items).peek_many(5) == sorted(items)[::-1][:5]
+
+    @mark.skipif(sys.version_info < (3, 8), reason='requires Python 3.8')
+    def test_view(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = NumericMinHeap(items, typecode='q')
+        with min_heap.view() as view:
+            assert view.readonly
+            assert view.format == 'q'
+            assert view.tolist() == min_heap.to_list()
+            # the heap can't be resized while its buffer is exported
+            with raises(BufferError):
+                min_heap.pop()
+        assert min_heap.pop() == min(items)
+
+    def test_pickle(self):
+        min_heap = NumericMinHeap(create_random_list(self.MAX_VAL, self.SIZE), 'i')
+        restored = pickle.loads(pickle.dumps(min_heap))
+        assert restored == min_heap
+        assert restored.typecode == 'i'
+
+
+class TestNumericMaxHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_pop(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = NumericMaxHeap(items)
+        max_heap.push(-1)
+        assert [max_heap.pop() for _ in range(len(max_heap))] == sorted(
+            items + [-1], reverse=True
+        )
+
+    def test_pop_many(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = NumericMaxHeap(items, typecode='i')
+        assert max_heap.pop_many(10) == sorted(items, reverse=True)[:10]
+        assert max_heap.push_pop(self.MAX_VAL) == self.MAX_VAL
+        assert max_heap.replace(self.MAX_VAL) == max(sorted(items)[:-10])
+
+    def test_numpy(self, monkeypatch):
+        importorskip('numpy')
+        monkeypatch.setattr(numericheap, '_NUMPY_MIN_SIZE', 0)
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = NumericMaxHeap(items)
+        assert max_heap.pop_many(self.SIZE) == sorted(items, reverse=True)
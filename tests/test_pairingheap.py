@@ -0,0 +1,128 @@
+import pickle
+from itertools import count
+from operator import itemgetter
+from random import shuffle
+
+from pytest import raises
+
+from binheap import MinHeap, PairingMaxHeap, PairingMinHeap
+from .utils import create_random_list
+
+
+class TestPairingMinHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_init(self):
+        assert PairingMinHeap().to_list() == []
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = PairingMinHeap(items)
+        assert len(min_heap) == self.SIZE
+        assert sorted(min_heap) == sorted(items)
+
+    def test_peek_and_pop(self):
+        with raises(IndexError):
+            PairingMinHeap().peek()
+        with raises(IndexError):
+            PairingMinHeap().pop()
+
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = PairingMinHeap(items)
+        assert min_heap.peek() == min(items)
+        assert [min_heap.pop() for _ in items] == sorted(items)
+        assert len(min_heap) == 0
+
+    def test_push(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        min_heap = PairingMinHeap()
+        min_heap.push(items[0])
+        min_heap.push(items[1:])
+        min_heap.push(iter([-1]))
+        assert [min_heap.pop() for _ in range(len(min_heap))] == sorted(items + [-1])
+
+    def test_push_pop_and_replace(self):
+        min_heap = PairingMinHeap([5, 7])
+        assert min_heap.push_pop(1) == 1
+        assert min_heap.push_pop(6) == 5
+        assert min_heap.replace(9) == 6
+        assert sorted(min_heap) == [7, 9]
+        with raises(IndexError):
+            PairingMinHeap().replace(1)
+
+    def test_update_and_remove(self):
+        items = list(range(self.SIZE))
+        shuffle(items)
+        min_heap = PairingMinHeap()
+        nodes = {item: min_heap.insert(item) for item in items}
+        # popping pairs the nodes into a deeper tree
+        assert min_heap.push_pop(self.MAX_VAL) == 0
+        del nodes[0]
+        expected = list(nodes) + [self.MAX_VAL]
+
+        # moved towards the root, then away from it
+        for item, new_item in zip(
+            items[:10], (-5, 200, 50, -7, 3, 2.5, -1, 60, 70, -9)
+        ):
+            if item == 0:
+                continue
+            min_heap.update(nodes.pop(item), new_item)
+            expected.remove(item)
+            expected.append(new_item)
+        for item in list(nodes)[:10]:
+            assert min_heap.remove(nodes.pop(item)) == item
+            expected.remove(item)
+        assert len(min_heap) == len(expected)
+        assert [min_heap.pop() for _ in expected] == sorted(expected)
+
+    def test_key(self):
+        items = [(2, 'a'), (1, 'b'), (2, 'c'), (1, 'd'), (2, 'e')]
+        min_heap = PairingMinHeap(items, key=lambda item: item[0])
+        assert (2, 'c') in min_heap
+        assert [min_heap.pop() for _ in items] == sorted(
+            items, key=lambda item: item[0]
+        )
+
+    def test_meld(self):
+        items, others = (create_random_list(self.MAX_VAL, size) for size in (10, 40))
+        min_heap, other = PairingMinHeap(items), PairingMinHeap(others)
+        min_heap.meld(other)
+        assert len(other) == 0
+        min_heap.meld(MinHeap([1]))
+        merged = PairingMinHeap.merge(min_heap, PairingMinHeap([0]))
+        assert len(min_heap) == 51
+        assert [merged.pop() for _ in range(52)] == sorted(items + others + [1, 0])
+
+    def test_repr(self):
+        assert repr(PairingMinHeap()) == 'PairingMinHeap()'
+        assert repr(PairingMinHeap([1])) == 'PairingMinHeap([1])'
+
+    def test_pickle(self):
+        # pushing in order links every node as a child of the root, pickling
+        # must not recurse along them
+        min_heap = PairingMinHeap(range(10000))
+        restored = pickle.loads(pickle.dumps(min_heap))
+        assert len(restored) == 10000
+        assert [restored.pop() for _ in range(10000)] == list(range(10000))
+
+    def test_pickle_counter(self, monkeypatch):
+        items = [(0, {'id': i}) for i in range(5)]
+        data = pickle.dumps(PairingMinHeap(items, key=itemgetter(0)))
+        # unpickled in a process where the insertion counter starts over
+        monkeypatch.setattr(PairingMinHeap, '_counter', count())
+        restored = pickle.loads(data)
+        restored.push([(0, {'id': 'new'})])
+        assert [restored.pop()[1]['id'] for _ in range(6)] == [0, 1, 2, 3, 4, 'new']
+
+
+class TestPairingMaxHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_pop(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        max_heap = PairingMaxHeap(items)
+        node = max_heap.insert(-1)
+        max_heap.update(node, self.MAX_VAL)
+        assert max_heap.peek() == self.MAX_VAL
+        assert [max_heap.pop() for _ in range(len(max_heap))] == sorted(
+            items + [self.MAX_VAL], reverse=True
+        )
@@ -0,0 +1,106 @@
+from math import floor
+from random import randrange
+
+from pytest import approx, raises
+
+from binheap import RunningMedian, RunningQuantile
+from .utils import create_random_list
+
+
+def quantile(numbers, q):
+    numbers = sorted(numbers)
+    position = q * (len(numbers) - 1)
+    lower = floor(position)
+    if lower == position:
+        return numbers[lower]
+    return numbers[lower] + (numbers[lower + 1] - numbers[lower]) * (position - lower)
+
+
+class TestRunningQuantile:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_add(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        for q in (0, 0.1, 0.25, 0.5, 0.9, 1):
+            running = RunningQuantile(q)
+            for i, item in enumerate(items, 1):
+                running.add(item)
+                assert running.value == approx(quantile(items[:i], q))
+            assert len(running) == self.SIZE
+
+    def test_add_many(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        running = RunningQuantile(0.75, items[:10])
+        assert running.value == approx(quantile(items[:10], 0.75))
+        # smaller batches go to the heaps, larger ones are sorted
+        for start, stop in ((10, 15), (15, 20), (20, 50)):
+            running.add_many(items[start:stop])
+            assert running.value == approx(quantile(items[:stop], 0.75))
+
+    def test_remove(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        running = RunningQuantile(0.3, items)
+        while items:
+            item = items.pop(randrange(len(items)))
+            running.remove(item)
+            assert len(running) == len(items)
+            if items:
+                assert running.value == approx(quantile(items, 0.3))
+        with raises(ValueError):
+            running.remove(0)
+        with raises(IndexError):
+            running.value
+
+    def test_window(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        running = RunningQuantile(0.9, window=10)
+        for i, item in enumerate(items, 1):
+            running.add(item)
+            assert running.value == approx(quantile(items[max(i - 10, 0) : i], 0.9))
+        running.add_many(items[:5])
+        assert running.value == approx(quantile(items[-5:] + items[:5], 0.9))
+        running.add_many(items[:20])
+        assert len(running) == 10
+        assert running.value == approx(quantile(items[10:20], 0.9))
+
+    def test_window_remove(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        running = RunningQuantile(0.5, window=10)
+        window = []
+        for item in items:
+            running.add(item)
+            window.append(item)
+            del window[:-10]
+            if len(window) > 3:
+                number = window[randrange(len(window))]
+                running.remove(number)
+                window.remove(number)
+            assert len(running) == len(window)
+            assert running.value == approx(quantile(window, 0.5))
+        running.add_many(items[:20])
+        assert len(running) == 10
+        assert running.value == approx(quantile(items[10:20], 0.5))
+
+    def test_invalid(self):
+        with raises(ValueError):
+            RunningQuantile(1.5)
+        with raises(ValueError):
+            RunningQuantile(0.5, window=0)
+
+
+class TestRunningMedian:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_median(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        running = RunningMedian()
+        for i, item in enumerate(items, 1):
+            running.add(item)
+            assert running.value == approx(quantile(items[:i], 0.5))
+        assert running.q == 0.5
+        assert repr(running) == f'RunningMedian({self.SIZE} numbers)'
+
+        running = RunningMedian([3, 1, 2, 4], window=3)
+        assert running.value == 2
+        running.add(10)
+        assert running.value == 4
@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+
+from pytest import mark, raises
+
+import binheap
+from binheap import SharedNumericMaxHeap, SharedNumericMinHeap
+from .utils import create_random_list
+
+# multiprocessing.shared_memory is new in Python 3.8.
+pytestmark = mark.skipif(
+    sys.version_info < (3, 8), reason='shared memory requires Python 3.8'
+)
+
+
+def push_range(heap, start, stop):
+    for item in range(start, stop):
+        heap.push(item)
+    heap.close()
+
+
+class TestSharedNumericHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_push_and_pop(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        with SharedNumericMinHeap(self.SIZE + 1) as heap:
+            try:
+                heap.push(items)
+                assert len(heap) == heap.capacity - 1
+                assert heap.peek() == min(items)
+                assert heap.push_pop(-1) == -1
+                heap.push(self.MAX_VAL)
+                with raises(IndexError):
+                    heap.push(0)
+                assert heap.replace(-2) == min(items)
+                assert heap.pop_many(10) == [-2] + sorted(items)[1:10]
+                assert [heap.pop() for _ in range(len(heap))] == sorted(items)[10:] + [
+                    self.MAX_VAL
+                ]
+                with raises(IndexError):
+                    heap.pop()
+            finally:
+                heap.unlink()
+
+    def test_max_heap_and_attach(self):
+        items = create_random_list(self.MAX_VAL, self.SIZE)
+        heap = SharedNumericMaxHeap(self.SIZE, typecode='i')
+        try:
+            heap.push(items)
+            with raises(ValueError):
+                SharedNumericMinHeap.attach(heap.name, heap._lock)
+            with SharedNumericMaxHeap.attach(heap.name, heap._lock) as other:
+                assert other.typecode == 'i'
+                assert other.to_list() == heap.to_list()
+                assert other.pop() == max(items)
+            assert heap.pop_many(self.SIZE) == sorted(items, reverse=True)[1:]
+        finally:
+            heap.close()
+            heap.unlink()
+
+    def test_processes(self):
+        heap = SharedNumericMinHeap(1000)
+        try:
+            workers = [
+                multiprocessing.Process(
+                    target=push_range, args=(heap, i * 250, (i + 1) * 250)
+                )
+                for i in range(4)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            assert heap.pop_many(1000) == list(range(1000))
+        finally:
+            heap.close()
+            heap.unlink()
+
+    def test_pickle_outside_of_process_spawning(self):
+        with SharedNumericMinHeap(1) as heap:
+            try:
+                with raises(RuntimeError):
+                    pickle.dumps(heap)
+            finally:
+                heap.unlink()
+
+    def test_lifecycle(self):
+        # a heap dropped without being closed releases its views first
+        code = (
+            'import binheap\n'
+            'heap = binheap.SharedNumericMinHeap(1)\n'
+            'heap.push(1)\n'
+            'heap.unlink()\n'
+            'del heap\n'
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(binheap.__path__[0]))
+        stderr = subprocess.run(
+            [sys.executable, '-c', code],
+            env=env,
+            check=True,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        ).stderr
+        assert stderr == ''
+
+        # the block is freed if the heap can't be opened
+        name = f'binheap-test-{os.getpid()}'
+        with raises(ValueError):
+            SharedNumericMinHeap(1, typecode='u', name=name)
+        with raises(FileNotFoundError):
+            SharedNumericMinHeap.attach(name, None)
+
+        with raises(ValueError):
+            SharedNumericMinHeap(-5)
@@ -0,0 +1,79 @@
+from pytest import raises
+
+from binheap import TimerHeap, timerheap
+from .utils import create_random_list
+
+
+class TestTimerHeap:
+    MAX_VAL, SIZE = 100, 50
+
+    def test_pop(self):
+        deadlines = create_random_list(self.MAX_VAL, self.SIZE)
+        heap = TimerHeap()
+        for index, deadline in enumerate(deadlines):
+            heap.push(deadline, index)
+        assert len(heap) == self.SIZE
+        assert heap.peek()[0] == min(deadlines)
+        popped = [heap.pop() for _ in deadlines]
+        # equal deadlines are popped in push order
+        assert popped == sorted((d, i) for i, d in enumerate(deadlines))
+
+        with raises(IndexError):
+            heap.pop()
+        with raises(IndexError):
+            heap.peek()
+
+    def test_cancel(self):
+        deadlines = create_random_list(self.MAX_VAL, self.SIZE)
+        heap = TimerHeap()
+        handles = [heap.push(deadline, i) for i, deadline in enumerate(deadlines)]
+        for handle in handles[::2]:
+            assert handle.cancel()
+            assert not handle.cancel()
+            assert handle.cancelled
+        assert len(heap) == self.SIZE // 2
+        expected = sorted((d, i) for i, d in enumerate(deadlines) if i % 2)
+        assert heap.peek() == expected[0]
+        assert [heap.pop() for _ in expected] == expected
+        assert len(heap) == 0
+
+        # popped items can't be cancelled anymore
+        handle = heap.push(1, 'a')
+        heap.pop()
+        assert not handle.cancel()
+        assert not handle.cancelled
+
+    def test_compact(self, monkeypatch):
+        monkeypatch.setattr(timerheap, '_MIN_COMPACT_COUNT', 0)
+        heap = TimerHeap(compact_ratio=0.5)
+        handles = [heap.push(deadline, None) for deadline in range(10)]
+        for handle in handles[:5]:
+            handle.cancel()
+        assert len(heap._heap) == 10
+        handles[5].cancel()
+        assert len(heap._heap) == len(heap) == 4
+        assert heap.pop() == (6, None)
+
+        with raises(ValueError):
+            TimerHeap(compact_ratio=0)
+
+    def test_pop_expired(self):
+        heap = TimerHeap()
+        handles = [heap.push(deadline, deadline) for deadline in range(10, 0, -1)]
+        handles[-2].cancel()  # deadline 2
+        assert heap.pop_expired(4) == [(1, 1), (3, 3), (4, 4)]
+        assert heap.pop_expired(4) == []
+        assert len(heap) == 6
+        assert heap.pop_expired(float('inf')) == [(d, d) for d in range(5, 11)]
+
+        # defaults to the monotonic clock
+        heap.push(0, 'due')
+        assert heap.pop_expired() == [(0, 'due')]
+
+    def test_clear(self):
+        heap = TimerHeap()
+        handle = heap.push(1, 'a')
+        heap.clear()
+        assert len(heap) == 0
+        assert not handle.cancel()
+        assert repr(heap) == 'TimerHeap(0 pending)'